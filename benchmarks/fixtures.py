@@ -0,0 +1,64 @@
+"""
+Deterministic inputs for the benchmarks: synthetic hand landmarks, feature vectors and
+camera-sized frames. Everything is generated from a fixed seed so runs are comparable.
+Recorded landmarks can be used instead by passing a .npy array of shape
+(frames, hands, 21, 2) or a landmark recording (.lmk, see core.landmarks) to
+`load_landmarks`.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.features import NUM_LANDMARKS, extract_features
+from core.landmarks import LandmarkRecording
+
+SEED = 1234
+
+# Rough open-hand template in normalised image coordinates (wrist first, then each finger)
+_HAND_TEMPLATE = np.array(
+    [[0.50, 0.80]]
+    + [[0.50 + dx * k, 0.75 - 0.07 * k] for dx in (-0.06, -0.03, 0.0, 0.03, 0.06) for k in (1, 2, 3, 4)],
+    dtype=np.float32,
+)
+
+
+def synthetic_landmarks(frames=300, hands=1, seed=SEED):
+    """Returns a (frames, hands, 21, 2) float32 array of a hand drifting slowly across the frame."""
+    rng = np.random.default_rng(seed)
+    drift = np.cumsum(rng.normal(0, 0.004, (frames, hands, 1, 2)), axis=0)
+    offsets = np.array([[[0.0, 0.0]], [[0.25, 0.0]]], dtype=np.float32)[:hands]
+    jitter = rng.normal(0, 0.003, (frames, hands, NUM_LANDMARKS, 2))
+    landmarks = _HAND_TEMPLATE[np.newaxis, np.newaxis] + offsets[np.newaxis] + drift + jitter
+    return np.clip(landmarks, 0.0, 1.0).astype(np.float32)
+
+
+def load_landmarks(path):
+    if path.endswith(".lmk"):
+        # First hand of every frame that has one, so all frames share a shape
+        recording = LandmarkRecording(path)
+        rows = recording.hand_counts > 0
+        return np.array(recording.landmarks[rows, :1, :, :2], dtype=np.float32)
+    return np.load(path).astype(np.float32)
+
+
+def as_mediapipe(landmarks):
+    """Wraps one frame's (hands, 21, 2) array in objects shaped like MediaPipe's multi_hand_landmarks."""
+    return [
+        SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=0.0) for x, y in hand])
+        for hand in landmarks
+    ]
+
+
+def features_for(landmarks):
+    return np.stack([extract_features(frame) for frame in landmarks])
+
+
+def synthetic_frames(count=8, height=720, width=1280, seed=SEED):
+    """Camera-like BGR frames: smooth gradients plus sensor noise, so encoders do realistic work."""
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:height, 0:width]
+    base = np.stack([xs * 255 // width, ys * 255 // height, (xs + ys) * 255 // (width + height)], axis=2)
+    return [
+        np.clip(base + rng.normal(0, 6, base.shape), 0, 255).astype(np.uint8)
+        for _ in range(count)
+    ]
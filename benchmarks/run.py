@@ -0,0 +1,271 @@
+"""
+Headless benchmark suite for the per-frame hot path (no camera, MediaPipe or Flet needed).
+
+    python -m benchmarks.run -o bench.json
+    python -m benchmarks.run -o new.json --baseline bench.json --threshold 0.25
+
+Each benchmark reports mean/p50/p95 in microseconds. With --baseline, the run fails
+(exit code 1) when any benchmark's p50 is slower than the baseline by more than the
+threshold fraction.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from benchmarks import fixtures
+from core.frames import FramePool
+from core.features import FEATURE_LENGTH, extract_features, hand_features
+from core.preview import PreviewEncoder
+from core.registry import ARTIFACT_PATH, LABELS_PATH, MODEL_PATH, get_model
+from core.pipeline import FramePacket
+from core.session import DetectionSession
+from core.sinks import FileSink, NullSink
+from core.subtitle import SubtitleRenderer, wrap_text, TEXT_SIZE, TEXT_THICKNESS
+
+SENTENCE = "A B C D E F G A B C"
+
+
+def measure(fn, iterations, warmup=5):
+    """Calls `fn(i)` repeatedly and returns per-call timings in microseconds."""
+    for i in range(warmup):
+        fn(i)
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        timings[i] = time.perf_counter() - started
+    timings *= 1e6
+    return {
+        "iterations": iterations,
+        "mean_us": float(timings.mean()),
+        "p50_us": float(np.percentile(timings, 50)),
+        "p95_us": float(np.percentile(timings, 95)),
+    }
+
+
+def frame_paths(frames):
+    """
+    The per-frame conversions of the live loop, before and after pooling: the legacy path
+    allocates a flipped copy plus an RGB copy for MediaPipe and another for the virtual
+    camera, while the pooled path converts once into a reused buffer.
+    """
+    shape = frames[0].shape
+    capture_pool, rgb_pool = FramePool(shape), FramePool(shape)
+
+    def legacy(i):
+        frame = cv2.flip(frames[i % len(frames)], 1)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def pooled(i):
+        captured = capture_pool.acquire()
+        np.copyto(captured, frames[i % len(frames)])  # Stands in for cap.read(buffer)
+        rgb = rgb_pool.acquire()
+        cv2.cvtColor(captured, cv2.COLOR_BGR2RGB, dst=rgb)
+        cv2.flip(rgb, 1, dst=rgb)
+        capture_pool.release(captured)
+        rgb_pool.release(rgb)
+
+    return {"frame.legacy_copies": legacy, "frame.pooled": pooled}
+
+
+def measure_memory(fn, iterations):
+    """Python-visible bytes allocated per call (tracemalloc) and the process RSS growth over the run."""
+    fn(0)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    for i in range(iterations):
+        fn(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"peak_traced_kb": peak / 1024, "max_rss_growth_kb": rss_after - rss_before}
+
+
+def sklearn_estimator():
+    """The pickled scikit-learn model, or None when sklearn isn't installed."""
+    try:
+        import sklearn  # Unpickling the model needs it
+    except ImportError:
+        return None
+    import pickle
+    with open(MODEL_PATH, "rb") as f:
+        return pickle.load(f)["model"]
+
+
+_LOAD_SCRIPT = """
+import json, resource, sys, time
+from core.registry import load_from_disk
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+loaded = load_from_disk(sys.argv[1], sys.argv[2])
+loaded.predict_with_proba([[0.0] * loaded.classifier.n_features_in_])
+elapsed = time.perf_counter() - started
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_growth_kb": after - before, "sklearn": "sklearn" in sys.modules}))
+"""
+
+
+def model_loading(runs=5):
+    """
+    Cold model load (including the imports it triggers) and resident-memory growth, each
+    run in a fresh interpreter: the model.p pickle against the native model.npz artifact.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for name, path in (("load.pickle", MODEL_PATH), ("load.npz", ARTIFACT_PATH)):
+        if not os.path.exists(path):
+            continue
+        samples = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", _LOAD_SCRIPT, path, LABELS_PATH], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+        timings = np.array([sample["seconds"] for sample in samples]) * 1e6
+        results[name] = {
+            "iterations": runs,
+            "mean_us": float(timings.mean()),
+            "p50_us": float(np.percentile(timings, 50)),
+            "p95_us": float(np.percentile(timings, 95)),
+            "max_rss_growth_kb": int(np.median([sample["rss_growth_kb"] for sample in samples])),
+            "imports_sklearn": samples[0]["sklearn"],
+        }
+    return results
+
+
+def run_benchmarks(landmarks, frames, iterations):
+    loaded = get_model()
+    features = fixtures.features_for(landmarks)
+    mediapipe_like = [fixtures.as_mediapipe(frame) for frame in landmarks]
+    buffer = np.zeros(FEATURE_LENGTH, dtype=np.float32)
+    n = len(landmarks)
+    results = {}
+
+    results["features.hand_features"] = measure(lambda i: hand_features(mediapipe_like[i % n], buffer), iterations)
+    results["features.extract_array"] = measure(lambda i: extract_features(landmarks[i % n], buffer), iterations)
+
+    results["predict.single"] = measure(lambda i: loaded.predict_with_proba(features[i % n][np.newaxis]), iterations)
+    estimator = sklearn_estimator()
+    if estimator is not None:
+        # The pickled model the compiled path replaced, for a before/after comparison
+        results["predict.sklearn_single"] = measure(
+            lambda i: estimator.predict_proba(features[i % n][np.newaxis]), max(iterations // 10, 10)
+        )
+    batch = features[:64]
+    results["predict.batch64"] = measure(lambda i: loaded.predict_with_proba(batch), max(iterations // 10, 10))
+
+    labels = loaded.class_labels
+    characters, probas = loaded.predict_with_proba(features)
+    for decoder in ("vote", "confidence"):
+        session = DetectionSession(decoder=decoder)
+        results[f"sentence.{decoder}"] = measure(
+            lambda i: session.advance_sentence(True, characters[i % n], i / 30, probas[i % n], labels), iterations
+        )
+
+    frame = frames[0]
+    H, W = frame.shape[:2]
+    results["subtitle.wrap_text"] = measure(lambda i: wrap_text(SENTENCE, W - 100, TEXT_SIZE, TEXT_THICKNESS), iterations)
+    renderer = SubtitleRenderer()
+    canvas = frame.copy()
+    results["subtitle.draw_cached"] = measure(lambda i: renderer.draw(canvas, SENTENCE), iterations)
+    results["subtitle.draw_uncached"] = measure(
+        lambda i: SubtitleRenderer().draw(canvas, SENTENCE), max(iterations // 10, 10)
+    )
+
+    encoder = PreviewEncoder(fps=0)
+    results["encode.preview_jpeg"] = measure(lambda i: encoder.encode(frames[i % len(frames)]), max(iterations // 10, 10))
+
+    session = DetectionSession()
+
+    def end_to_end(i):
+        extract_features(landmarks[i % n], buffer)
+        chars, proba = loaded.predict_with_proba(buffer[np.newaxis])
+        target = frames[i % len(frames)]
+        if session.advance_sentence(True, chars[0], i / 30, proba[0], labels):
+            if renderer.draw(target, session.constructed_sentence):
+                session.reset_subtitle()
+        encoder.encode(target)
+
+    results["end_to_end.no_mediapipe"] = measure(end_to_end, max(iterations // 10, 10))
+
+    for name, fn in frame_paths(frames).items():
+        results[name] = measure(fn, max(iterations // 10, 10))
+        results[name].update(measure_memory(fn, max(iterations // 10, 10)))
+
+    packets = [FramePacket(i, cv2.cvtColor(f, cv2.COLOR_BGR2RGB), 0.0) for i, f in enumerate(frames)]
+    with tempfile.TemporaryDirectory() as directory:
+        for name, sink in (("sink.null", NullSink()), ("sink.file_mjpeg", FileSink(os.path.join(directory, "out.avi")))):
+            sink.open(W, H, 30)
+            results[name] = measure(lambda i: sink.send(packets[i % len(packets)]), max(iterations // 10, 10))
+            sink.close()
+
+    results.update(model_loading())
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of (name, old p50, new p50) for benchmarks slower than baseline by more than threshold."""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old and result["p50_us"] > old["p50_us"] * (1 + threshold):
+            regressions.append((name, old["p50_us"], result["p50_us"]))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the BISINDO per-frame hot path.")
+    parser.add_argument("-o", "--output", help="Write results as JSON")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--landmarks", help="Recorded landmarks (.lmk recording or .npy, frames x hands x 21 x 2) instead of synthetic ones")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slowdown before failing (fraction)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    landmarks = fixtures.load_landmarks(args.landmarks) if args.landmarks else fixtures.synthetic_landmarks()
+    frames = fixtures.synthetic_frames()
+    results = run_benchmarks(landmarks, frames, args.iterations)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "landmarks": args.landmarks or "synthetic",
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    for name, result in results.items():
+        print(f"{name:28s} p50 {result['p50_us']:10.1f} us   p95 {result['p95_us']:10.1f} us")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for name, old, new in regressions:
+            print(f"❌ {name}: p50 {old:.1f} us -> {new:.1f} us")
+        if regressions:
+            return 1
+        print("✅ No regressions beyond the threshold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
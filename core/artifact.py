@@ -0,0 +1,162 @@
+"""
+Native model artifact: an uncompressed .npz holding the exported classifier arrays
+plus a JSON header (format, kind, labels, feature layout, version).
+
+Loading needs neither pickle nor sklearn. Every array is memory-mapped straight out
+of the archive, so load time and resident memory stay flat as the forest grows;
+pages are only read when prediction touches them.
+
+Convert an existing pickle once (this side does need sklearn):
+
+    python -m core.artifact model.p -o model.npz --labels label_dict.json --version v3
+
+The header records the SHA-1 of the pickle and label map it was built from, so
+core.registry can tell when they were edited afterwards and load them instead.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+from core.classifier import FastClassifier, export_model
+from core.features import FEATURE_LENGTH, NUM_LANDMARKS
+
+FORMAT = "bisindo-model"
+FORMAT_VERSION = 1
+HEADER_MEMBER = "header.json"
+FEATURE_LAYOUT = {
+    "length": FEATURE_LENGTH,
+    "hands": 2,
+    "landmarks": NUM_LANDMARKS,
+    "order": "hand, landmark, (x, y) minus the hand's minimum x / y; missing hand zero-filled",
+}
+_SCALARS = ("n_features", "max_depth", "n_neighbors")  # Stored in the header rather than as 0-d arrays
+
+
+def source_digests(model_path, labels_path):
+    """SHA-1 of the pickle and label map an artifact is built from, keyed by file name."""
+    digests = {}
+    for path in (model_path, labels_path):
+        with open(path, "rb") as f:
+            digests[os.path.basename(path)] = hashlib.sha1(f.read()).hexdigest()
+    return digests
+
+
+def save_artifact(path, exported, labels, version=None, source=None):
+    arrays = {key: np.ascontiguousarray(value) for key, value in exported.items()
+              if key != "kind" and key not in _SCALARS}
+    header = {
+        "format": FORMAT,
+        "format_version": FORMAT_VERSION,
+        "kind": str(exported["kind"]),
+        "version": version,
+        "labels": {str(key): value for key, value in labels.items()},
+        "feature_layout": FEATURE_LAYOUT,
+        "arrays": sorted(arrays),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "source": source,  # source_digests() of the files this was converted from, if any
+    }
+    header.update({key: int(exported[key]) for key in _SCALARS if key in exported})
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr(HEADER_MEMBER, json.dumps(header, indent=2))
+        for name, array in arrays.items():
+            with archive.open(name + ".npy", "w", force_zip64=True) as member:
+                np.lib.format.write_array(member, array, allow_pickle=False)
+
+
+def _member_offset(f, info):
+    """Position of a stored member's data: after its local file header, whose extra field may differ from the central one."""
+    f.seek(info.header_offset)
+    local = f.read(30)
+    if local[:4] != b"PK\x03\x04":
+        raise ValueError(f"Corrupt archive entry {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", local[26:30])
+    return info.header_offset + 30 + name_length + extra_length
+
+
+def read_header(path):
+    with zipfile.ZipFile(path) as archive:
+        header = json.loads(archive.read(HEADER_MEMBER))
+    if header.get("format") != FORMAT or header.get("format_version", 0) > FORMAT_VERSION:
+        raise ValueError(f"{path} is not a supported model artifact")
+    return header
+
+
+def load_artifact(path, mmap=True):
+    """Returns (FastClassifier, labels, header) from an artifact written by `save_artifact`."""
+    header = read_header(path)
+    exported = {"kind": header["kind"]}
+    exported.update({key: header[key] for key in _SCALARS if key in header})
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for name in header["arrays"]:
+            info = archive.getinfo(name + ".npy")
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: array {name} is compressed and cannot be memory-mapped")
+            f.seek(_member_offset(f, info))
+            major, _ = np.lib.format.read_magic(f)
+            read_array_header = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_array_header(f)
+            if dtype.hasobject:
+                raise ValueError(f"{path}: array {name} holds Python objects")
+            if mmap and shape and int(np.prod(shape)) > 0:
+                array = np.memmap(f, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                                  order="F" if fortran_order else "C").view(np.ndarray)  # Still file-backed
+            else:
+                array = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(
+                    shape, order="F" if fortran_order else "C")
+            exported[name] = array
+    return FastClassifier(exported), header["labels"], header
+
+
+def convert_pickle(model_path, output_path, labels_path=None, version=None):
+    """Writes the estimator in a model.p pickle (and its label map) as a native artifact."""
+    import pickle
+    with open(model_path, "rb") as f:
+        estimator = pickle.load(f)["model"]
+    labels = {}
+    source = None
+    if labels_path:
+        with open(labels_path, "r") as f:
+            labels = json.load(f)
+        source = source_digests(model_path, labels_path)
+    save_artifact(output_path, export_model(estimator), labels, version, source)
+    return estimator
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Convert a pickled BISINDO model into the native .npz artifact.")
+    parser.add_argument("model", help="model.p pickle")
+    parser.add_argument("-o", "--output", required=True, help="Artifact to write (.npz)")
+    parser.add_argument("--labels", help="label_dict.json to embed in the header")
+    parser.add_argument("--version", help="Version string stored in the header")
+    parser.add_argument("--no-verify", action="store_true", help="Skip comparing predictions with the pickle")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    estimator = convert_pickle(args.model, args.output, args.labels, args.version)
+    print(f"✅ Wrote {args.output}")
+    if args.no_verify:
+        return 0
+    classifier, _, _ = load_artifact(args.output)
+    rng = np.random.default_rng(0)
+    X = rng.random((2000, classifier.n_features_in_), dtype=np.float32) * 0.5
+    if not np.array_equal(estimator.predict(X), classifier.predict(X)):
+        print("❌ Predictions differ from the pickled model.")
+        return 1
+    if classifier.kind == "forest" and not np.array_equal(estimator.predict_proba(X), classifier.predict_proba(X)):
+        print("❌ Probabilities differ from the pickled model.")
+        return 1
+    print("✅ Predictions match the pickled model.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Frame sources for the detection engine, all behind one interface:
+
+    source.open() -> bool
+    source.read(buffer) -> (ok, frame, captured_at)   # fills `buffer` when it can
+    source.release()
+
+CameraSource applies the requested resolution, FPS, FOURCC and driver buffer depth;
+FileSource plays a video file (at its own rate unless `realtime` is off);
+SyntheticSource generates moving frames for headless runs. ThreadedSource wraps any
+of them with a grab thread that keeps only the newest frame, so the loop never
+reads a stale frame out of a deep driver buffer. `open_source` builds the right
+one from settings.capture.
+"""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from core import settings
+
+SYNTHETIC = "synthetic"
+SYNTHETIC_SIZE = (640, 480)
+READ_TIMEOUT = 2.0  # Seconds a threaded read waits for a new frame before giving up
+
+
+class CaptureSource:
+    width = 0
+    height = 0
+    fps = 0.0
+
+    def open(self):
+        return True
+
+    def read(self, buffer=None):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def describe(self):
+        return f"{type(self).__name__} {self.width}x{self.height} @ {self.fps:.0f} fps"
+
+
+class CameraSource(CaptureSource):
+    """A webcam through cv2.VideoCapture, with the capture properties applied before the first read."""
+
+    def __init__(self, index=0, width=0, height=0, fps=0, mjpg=False, buffer_size=1):
+        self.index = index
+        self.requested = {"width": width, "height": height, "fps": fps, "mjpg": mjpg, "buffer_size": buffer_size}
+        self.cap = None
+        self.fourcc = ""
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            return False
+        requested = self.requested
+        # FOURCC first: many UVC drivers only offer high resolutions at full rate in MJPG
+        if requested["mjpg"]:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        if requested["width"] and requested["height"]:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, requested["width"])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, requested["height"])
+        if requested["fps"]:
+            self.cap.set(cv2.CAP_PROP_FPS, requested["fps"])
+        if requested["buffer_size"]:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, requested["buffer_size"])  # Not every backend supports this
+        # What the driver actually granted
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+        code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.fourcc = "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)).strip("\x00")
+        return True
+
+    def read(self, buffer=None):
+        ok, frame = self.cap.read(buffer)
+        return ok, frame, time.perf_counter()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def describe(self):
+        return f"Kamera {self.index} {self.width}x{self.height} @ {self.fps:.0f} fps {self.fourcc}".rstrip()
+
+
+class FileSource(CameraSource):
+    """A video file, read at its recorded frame rate when `realtime` so it behaves like a live camera."""
+
+    def __init__(self, path, realtime=True):
+        super().__init__(path)
+        self.realtime = realtime
+        self.next_frame = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            return False
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+        return True
+
+    def read(self, buffer=None):
+        if self.realtime and self.fps > 0:
+            now = time.perf_counter()
+            self.next_frame = now if self.next_frame is None else self.next_frame + 1.0 / self.fps
+            delay = self.next_frame - now
+            if delay > 0:
+                time.sleep(delay)
+        return super().read(buffer)
+
+    def describe(self):
+        return f"File {self.index} {self.width}x{self.height} @ {self.fps:.0f} fps"
+
+
+class SyntheticSource(CaptureSource):
+    """Endless moving gradient at a fixed rate; exercises the whole pipeline without a camera."""
+
+    def __init__(self, width=0, height=0, fps=0):
+        self.width = width or SYNTHETIC_SIZE[0]
+        self.height = height or SYNTHETIC_SIZE[1]
+        self.fps = float(fps or 30)
+        self.index = 0
+        self.next_frame = None
+        xs = np.arange(self.width * 2) * 255 // (self.width * 2)
+        ys = np.arange(self.height) * 255 // self.height
+        self.base = np.stack(np.broadcast_arrays(xs[np.newaxis, :], ys[:, np.newaxis], 128 + 0 * xs[np.newaxis, :]), axis=2).astype(np.uint8)
+
+    def read(self, buffer=None):
+        now = time.perf_counter()
+        self.next_frame = now if self.next_frame is None else self.next_frame + 1.0 / self.fps
+        delay = self.next_frame - now
+        if delay > 0:
+            time.sleep(delay)
+        if buffer is None or buffer.shape != (self.height, self.width, 3):
+            buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        offset = self.index % self.width
+        buffer[:] = self.base[:, offset:offset + self.width]
+        self.index += 1
+        return True, buffer, time.perf_counter()
+
+
+class ThreadedSource(CaptureSource):
+    """
+    Reads the wrapped source continuously on its own thread and hands out only the
+    newest frame, stamped with the time it was grabbed. Frames nobody asked for in
+    time are dropped here instead of queueing up in the driver.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.front = None
+        self.back = None
+        self.captured_at = 0.0
+        self.sequence = 0
+        self.taken = 0
+        self.dropped = 0
+        self.finished = False
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def open(self):
+        if not self.source.open():
+            return False
+        self.width, self.height, self.fps = self.source.width, self.source.height, self.source.fps
+        self.thread = threading.Thread(target=self._grab, name="capture-grab", daemon=True)
+        self.thread.start()
+        return True
+
+    def _grab(self):
+        while not self.finished:
+            ok, frame, captured_at = self.source.read(self.back)
+            with self.cond:
+                if not ok:
+                    self.finished = True
+                else:
+                    self.back, self.front = self.front, frame
+                    self.captured_at = captured_at
+                    if self.sequence > self.taken:
+                        self.dropped += 1
+                    self.sequence += 1
+                self.cond.notify_all()
+
+    def read(self, buffer=None):
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.sequence > self.taken or self.finished, READ_TIMEOUT):
+                return False, None, time.perf_counter()
+            if self.sequence <= self.taken:
+                return False, None, time.perf_counter()
+            self.taken = self.sequence
+            if buffer is not None and buffer.shape == self.front.shape:
+                np.copyto(buffer, self.front)
+                frame = buffer
+            else:
+                frame = self.front.copy()
+            return True, frame, self.captured_at
+
+    def release(self):
+        with self.cond:
+            self.finished = True
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(READ_TIMEOUT)
+        self.source.release()
+
+    def describe(self):
+        return self.source.describe() + " (threaded)"
+
+
+def open_source(source=None, config=None, realtime=True):
+    """
+    Builds a source from a camera index, a video file path or "synthetic" (default:
+    settings.capture["source"]) with the capture settings in `config`.
+    """
+    config = config or settings.capture
+    source = config["source"] if source is None else source
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    if source == SYNTHETIC:
+        capture = SyntheticSource(config["width"], config["height"], config["fps"])
+    elif isinstance(source, str):
+        capture = FileSource(source, realtime)
+    else:
+        capture = CameraSource(source, config["width"], config["height"], config["fps"], config["mjpg"], config["buffer_size"])
+    if config["threaded"] and isinstance(capture, CameraSource) and not isinstance(capture, FileSource):
+        capture = ThreadedSource(capture)
+    return capture
@@ -0,0 +1,140 @@
+import numpy as np
+
+TREE_LEAF = -1
+
+
+def export_model(estimator):
+    """
+    Flattens a fitted scikit-learn classifier into plain NumPy arrays that FastClassifier
+    can evaluate without sklearn. Supports random forests / single decision trees,
+    linear classifiers (coef_/intercept_) and uniform-weight Euclidean kNN.
+    """
+    name = type(estimator).__name__
+    if hasattr(estimator, "estimators_") or hasattr(estimator, "tree_"):
+        exported = _export_forest(estimator)
+    elif hasattr(estimator, "coef_") and hasattr(estimator, "intercept_"):
+        exported = {
+            "kind": "linear",
+            "classes": np.asarray(estimator.classes_),
+            "coef": np.asarray(estimator.coef_, dtype=np.float64),
+            "intercept": np.asarray(estimator.intercept_, dtype=np.float64),
+        }
+    elif name == "KNeighborsClassifier":
+        if estimator.weights != "uniform" or estimator.effective_metric_ != "euclidean":
+            raise ValueError("Only uniform-weight Euclidean kNN models can be exported.")
+        exported = {
+            "kind": "knn",
+            "classes": np.asarray(estimator.classes_),
+            "fit_X": np.asarray(estimator._fit_X, dtype=np.float64),
+            "fit_y": np.asarray(estimator._y, dtype=np.int64),
+            "n_neighbors": np.int64(estimator.n_neighbors),
+        }
+    else:
+        raise ValueError(f"Unsupported model type: {name}")
+    exported["n_features"] = np.int64(estimator.n_features_in_)
+    return exported
+
+
+def _export_forest(estimator):
+    trees = estimator.estimators_ if hasattr(estimator, "estimators_") else [estimator]
+    n_classes = int(estimator.n_classes_)
+    feature, threshold, left, right, missing_left, leaf_proba, roots = [], [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        t = tree.tree_
+        ids = np.arange(t.node_count)
+        is_leaf = t.children_left == TREE_LEAF
+        # Leaves point at themselves and always "go left", so traversal can run a fixed number of steps
+        feature.append(np.where(is_leaf, 0, t.feature).astype(np.int32))
+        threshold.append(np.where(is_leaf, np.inf, t.threshold))
+        left.append((np.where(is_leaf, ids, t.children_left) + offset).astype(np.int32))
+        right.append((np.where(is_leaf, ids, t.children_right) + offset).astype(np.int32))
+        missing = getattr(t, "missing_go_to_left", None)
+        missing_left.append(np.zeros(t.node_count, dtype=bool) if missing is None else (missing.astype(bool) | is_leaf))
+        # Same normalisation as DecisionTreeClassifier.predict_proba
+        proba = t.value[:, 0, :n_classes].copy()
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        proba /= normalizer
+        leaf_proba.append(proba)
+        roots.append(offset)
+        offset += t.node_count
+    return {
+        "kind": "forest",
+        "classes": np.asarray(estimator.classes_),
+        "feature": np.concatenate(feature),
+        "threshold": np.concatenate(threshold),
+        "left": np.concatenate(left),
+        "right": np.concatenate(right),
+        "missing_left": np.concatenate(missing_left),
+        "leaf_proba": np.concatenate(leaf_proba),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "max_depth": np.int64(max(tree.tree_.max_depth for tree in trees)),
+    }
+
+
+class FastClassifier:
+    """Predicts from an exported model with plain NumPy; labels are identical to the sklearn estimator."""
+
+    def __init__(self, exported):
+        self.kind = str(exported["kind"])
+        self.arrays = exported
+        self.classes_ = exported["classes"]
+        self.n_features_in_ = int(exported["n_features"])
+
+    def predict(self, X):
+        X = np.asarray(X)
+        single = X.ndim == 1
+        X = X.reshape(1, -1) if single else X
+        if self.kind == "forest":
+            labels = self.classes_.take(np.argmax(self._forest_proba(X), axis=1))
+        elif self.kind == "linear":
+            labels = self._linear_predict(X)
+        else:
+            labels = self._knn_predict(X)
+        return labels[0] if single else labels
+
+    def predict_proba(self, X):
+        if self.kind != "forest":
+            raise ValueError(f"predict_proba is not available for {self.kind} models.")
+        X = np.asarray(X)
+        return self._forest_proba(X.reshape(1, -1))[0] if X.ndim == 1 else self._forest_proba(X)
+
+    def _forest_proba(self, X):
+        a = self.arrays
+        # Trees compare float32 features against float64 thresholds, as sklearn does
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.broadcast_to(a["roots"], (len(X), len(a["roots"])))
+        has_nan = np.isnan(X).any()
+        for _ in range(int(a["max_depth"])):
+            values = X[rows, a["feature"][nodes]]
+            go_left = values <= a["threshold"][nodes]
+            if has_nan:
+                go_left |= np.isnan(values) & a["missing_left"][nodes]
+            nodes = np.where(go_left, a["left"][nodes], a["right"][nodes])
+        # Accumulate tree by tree in estimator order (cumsum is sequential) to match
+        # RandomForestClassifier.predict_proba bit for bit
+        proba = np.cumsum(a["leaf_proba"][nodes], axis=1)[:, -1]
+        proba /= len(a["roots"])
+        return proba
+
+    def _linear_predict(self, X):
+        a = self.arrays
+        scores = X @ a["coef"].T + a["intercept"]
+        if scores.shape[1] == 1:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[np.argmax(scores, axis=1)]
+
+    def _knn_predict(self, X):
+        a = self.arrays
+        k = int(a["n_neighbors"])
+        distances = ((X[:, np.newaxis, :] - a["fit_X"][np.newaxis]) ** 2).sum(axis=2)
+        neighbours = np.argsort(distances, axis=1, kind="stable")[:, :k]
+        votes = a["fit_y"][neighbours]
+        counts = np.apply_along_axis(np.bincount, 1, votes, minlength=len(self.classes_))
+        return self.classes_[np.argmax(counts, axis=1)]
+
+
+def compile_model(estimator):
+    return FastClassifier(export_model(estimator))
@@ -0,0 +1,58 @@
+import numpy as np
+
+from core import settings
+
+SMOOTHING = 0.35  # Weight of the newest frame in the exponential moving average
+
+
+class ConfidenceDecoder:
+    """
+    Streaming letter decoder driven by classifier probabilities.
+
+    Keeps an exponential moving average of `predict_proba` and emits a letter as soon
+    as its smoothed confidence crosses the commit threshold, instead of waiting for a fixed
+    voting window. Hysteresis holds the decoder after each emission until the emitted
+    letter's confidence drops below the release threshold, so one held sign emits once.
+    Thresholds default to settings.sentence.
+    Each step costs O(number of classes).
+    """
+
+    def __init__(self, smoothing=SMOOTHING, commit_threshold=None, release_threshold=None):
+        self.smoothing = smoothing
+        self.commit_threshold = settings.sentence["commit_threshold"] if commit_threshold is None else commit_threshold
+        self.release_threshold = settings.sentence["release_threshold"] if release_threshold is None else release_threshold
+        self.average = None
+        self.held = None
+        self.labels = None
+
+    def reset(self):
+        self.average = None
+        self.held = None
+        self.labels = None
+
+    def step(self, proba, labels):
+        """Feeds one frame's probabilities (None when no hand is visible); returns an emitted label or None."""
+        if labels is not self.labels:  # A different model was swapped in; its classes don't line up with the average
+            self.reset()
+            self.labels = labels
+        if proba is None:
+            if self.average is not None:
+                self.average *= 1 - self.smoothing
+        elif self.average is None:
+            self.average = np.array(proba, dtype=np.float64)
+        else:
+            self.average *= 1 - self.smoothing
+            self.average += self.smoothing * np.asarray(proba)
+        if self.average is None:
+            return None
+
+        if self.held is not None:
+            if self.average[self.held] >= self.release_threshold:
+                return None
+            self.held = None
+
+        best = int(np.argmax(self.average))
+        if self.average[best] < self.commit_threshold:
+            return None
+        self.held = best
+        return labels[best]
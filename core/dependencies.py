@@ -0,0 +1,176 @@
+"""
+In-process dependency verification for the Instalasi page.
+
+Reads installed versions with importlib.metadata instead of spawning `pip show` per
+package, checks version specifiers, runs the checks concurrently and caches the
+results per environment (interpreter path + site-packages modification times), so
+a repeated check on an unchanged environment costs almost nothing.
+"""
+import os
+import re
+import sys
+import sysconfig
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+
+MAX_WORKERS = 8
+
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*([^;]*)")
+_SPECIFIER = re.compile(r"(===|==|!=|~=|>=|<=|>|<)\s*([^\s,]+)")
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class DependencyStatus:
+    """Result of checking one requirement line."""
+
+    def __init__(self, requirement, name, installed_version, satisfied, error=None):
+        self.requirement = requirement
+        self.name = name
+        self.installed_version = installed_version
+        self.satisfied = satisfied
+        self.error = error
+
+    def __repr__(self):
+        return f"DependencyStatus({self.requirement!r}, installed={self.installed_version!r}, ok={self.satisfied})"
+
+
+def parse_requirement(line):
+    """Splits a requirements.txt line into (name, specifier string); markers after ';' are ignored."""
+    match = _REQUIREMENT.match(line)
+    if not match:
+        raise ValueError(f"Unrecognised requirement: {line!r}")
+    return match.group(1), match.group(2).strip()
+
+
+def _release(version):
+    """The leading release numbers as written: "1.4.0rc1" -> (1, 4, 0)."""
+    parts = []
+    for piece in re.split(r"[.+-]", version):
+        number = re.match(r"\d+", piece)
+        if not number:
+            break
+        parts.append(int(number.group()))
+    return tuple(parts)
+
+
+def _version_key(version):
+    """Release numbers for ordering, with trailing zeros dropped so 1.4 == 1.4.0."""
+    parts = list(_release(version))
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def _has_prefix(version, prefix):
+    """Whether the release starts with `prefix`, treating missing components as zero (1.4 starts with 1.4.0)."""
+    release = _release(version)
+    release += (0,) * (len(prefix) - len(release))
+    return release[:len(prefix)] == prefix
+
+
+def _fallback_satisfies(version, specifier):
+    """Release-number comparison for when `packaging` is not installed; pre-release tags are ignored."""
+    installed = _version_key(version)
+    for op, wanted in _SPECIFIER.findall(specifier):
+        if wanted.endswith(".*"):
+            matches = _has_prefix(version, _release(wanted[:-2]))
+            if (op == "==" and not matches) or (op == "!=" and matches):
+                return False
+            continue
+        target = _version_key(wanted)
+        if op == "~=":
+            # Prefix from the release as written: ~=1.4.0 means >=1.4.0, ==1.4.*
+            release = _release(wanted)
+            ok = installed >= target and _has_prefix(version, release[:max(len(release) - 1, 1)])
+        else:
+            ok = {
+                "===": version == wanted,
+                "==": installed == target,
+                "!=": installed != target,
+                ">=": installed >= target,
+                "<=": installed <= target,
+                ">": installed > target,
+                "<": installed < target,
+            }[op]
+        if not ok:
+            return False
+    return True
+
+
+def satisfies(version, specifier):
+    if not specifier:
+        return True
+    try:
+        from packaging.specifiers import SpecifierSet
+    except ImportError:
+        return _fallback_satisfies(version, specifier)
+    return SpecifierSet(specifier).contains(version, prereleases=True)
+
+
+def check_requirement(line):
+    try:
+        name, specifier = parse_requirement(line)
+    except ValueError as e:
+        return DependencyStatus(line, line, None, False, str(e))
+    try:
+        version = metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return DependencyStatus(line, name, None, False)
+    try:
+        return DependencyStatus(line, name, version, satisfies(version, specifier))
+    except Exception as e:
+        return DependencyStatus(line, name, version, False, str(e))
+
+
+def environment_key():
+    """Identifies the current environment: the interpreter plus the mtimes of its site-packages directories."""
+    paths = {sysconfig.get_paths()[key] for key in ("purelib", "platlib")}
+    paths.update(p for p in sys.path if p.endswith(("site-packages", "dist-packages")))
+    stamps = []
+    for path in sorted(paths):
+        try:
+            stamps.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            continue
+    return (sys.executable, tuple(stamps))
+
+
+def verify_requirements(lines, on_result=None, use_cache=True):
+    """
+    Checks every requirement line concurrently and returns a list of DependencyStatus in
+    input order. `on_result(index, status)` is called as each check finishes (from the
+    worker threads), so callers can update progress incrementally.
+    """
+    lines = list(lines)
+    key = (environment_key(), tuple(lines))
+    if use_cache:
+        with _cache_lock:
+            cached = _cache.get(key)
+        if cached is not None:
+            if on_result:
+                for index, status in enumerate(cached):
+                    on_result(index, status)
+            return list(cached)
+
+    results = [None] * len(lines)
+
+    def run(index):
+        results[index] = check_requirement(lines[index])
+        if on_result:
+            on_result(index, results[index])
+
+    if lines:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(lines))) as executor:
+            list(executor.map(run, range(len(lines))))
+
+    with _cache_lock:
+        _cache[key] = tuple(results)
+    return results
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
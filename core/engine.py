@@ -0,0 +1,461 @@
+"""
+UI-independent detection engine.
+
+Runs the capture -> process -> outputs pipeline on its own threads and reports what
+happens as events, either through callbacks (`engine.on("subtitle", fn)`) or through
+async iterators (`async for event in engine.events()`), so the recognizer can be
+embedded in the Flet app, the WebSocket server or any other tool.
+
+Every event is a JSON-friendly dict with a "type" and a "time":
+
+    status      state ("starting", "running", "error", "stopped") and a display message
+    prediction  frame index, hand present, predicted character and its confidence
+    subtitle    the constructed sentence, whenever it changes
+    preview     a base64-encoded preview image (only encoded while someone listens)
+    metrics     the stage-timing HUD text and snapshot, once per second while metrics are on
+    stopped     per-stage throughput summary; always the last event of a run
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack
+
+import cv2
+import numpy as np
+
+from core import settings, startup
+from core.capture import open_source
+from core.features import FEATURE_LENGTH, hand_features
+from core.frames import FramePool, POOL_SIZE
+from core.governor import FrameGovernor
+from core.landmarks import LandmarkRecorder
+from core.metrics import Metrics, METRICS_FILE
+from core.pipeline import LatestQueue, FramePacket, StageStats, start_stage, start_paced_stage, format_stats
+from core.preview import PreviewEncoder
+from core.registry import get_model, acquire_hands, release_hands
+from core.roi import RoiTracker
+from core.session import DetectionSession
+from core.sinks import CallbackSink, FileSink, VirtualCamSink, open_sinks, close_sinks
+from core.subtitle import SubtitleRenderer
+
+ENABLE_VIRTUAL_CAM = sys.platform != "darwin"  # Disable virtual camera on macOS
+CAMERA_SOURCE = None  # None: use the source configured in settings.capture
+STREAM_SIZE = 32  # Events buffered per async consumer before the oldest are dropped
+RECORD_PATH = os.environ.get("BISINDO_RECORD_LANDMARKS")  # Landmark log written by every run, see core.landmarks
+VIDEO_PATH = os.environ.get("BISINDO_RECORD_VIDEO")  # Subtitled output recorded by every run (.mp4 or .avi)
+LATENCY_SMOOTHING = 0.1  # Weight of the newest frame in the published capture-to-process latency
+EVENTS = ("status", "prediction", "subtitle", "preview", "metrics", "stopped")
+
+
+def create_hands(static_image_mode=False):
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        min_detection_confidence=0.6,
+        min_tracking_confidence=0.6
+    )
+
+
+class EventStream:
+    """
+    Async iterator over one consumer's engine events. Events arrive from the engine's
+    threads and are buffered in the consumer's event loop; when the consumer falls
+    behind, the oldest buffered events are dropped so a slow reader never stalls the
+    engine or other consumers. Iteration ends after the engine's "stopped" event or
+    when the stream is closed.
+    """
+
+    def __init__(self, engine, kinds, maxsize, loop):
+        self.engine = engine
+        self.kinds = set(kinds) if kinds else None
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.closed = False
+
+    def wants(self, kind):
+        return not self.closed and (self.kinds is None or kind in self.kinds)
+
+    def push(self, event):
+        """Thread-safe; called by the engine."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # The consumer's loop has already shut down
+            self.closed = True
+
+    def _put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.engine._unsubscribe(self)
+            self.push(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        event = await self.queue.get()
+        if event is None:
+            self.closed = True
+            raise StopAsyncIteration
+        if event["type"] == "stopped":
+            self.close()
+        return event
+
+
+class DetectionEngine:
+    """
+    One recognizer run over a camera index, a video file or "synthetic" frames
+    (default: settings.capture, see core.capture). The session holds the
+    sentence state; the model and MediaPipe graphs are shared process-wide through
+    core.registry. `start()` returns immediately; `stop()` asks the run to finish.
+
+    Processed frames fan out to the preview (while anyone listens for preview
+    events), the virtual camera, a video file when `video_path` is given, and any
+    extra `sinks` (see core.sinks).
+    """
+
+    def __init__(self, session=None, source=CAMERA_SOURCE, metrics=None, virtual_cam=ENABLE_VIRTUAL_CAM, realtime=True,
+                 record_path=RECORD_PATH, video_path=VIDEO_PATH, sinks=()):
+        self.session = session or DetectionSession()
+        self.source = source
+        self.metrics = metrics or Metrics()
+        self.use_virtual_cam = virtual_cam
+        self.realtime = realtime  # Play video files at their own frame rate instead of as fast as possible
+        self.record_path = record_path
+        self.video_path = video_path
+        self.extra_sinks = list(sinks)
+        self.listeners = {kind: [] for kind in EVENTS}
+        self.streams = []
+        self.lock = threading.Lock()
+        self.stop_requested = threading.Event()
+        self.thread = None
+        self.sinks = []
+        self.stats = []
+
+    def on(self, kind, callback):
+        """Calls `callback(event)` for every `kind` event, on the engine thread that produced it."""
+        with self.lock:
+            self.listeners[kind].append(callback)
+        return callback
+
+    def off(self, kind, callback):
+        with self.lock:
+            if callback in self.listeners[kind]:
+                self.listeners[kind].remove(callback)
+
+    def events(self, kinds=None, maxsize=STREAM_SIZE):
+        """Async iterator of events for the calling event loop; `kinds` limits which types it receives."""
+        stream = EventStream(self, kinds, maxsize, asyncio.get_running_loop())
+        with self.lock:
+            self.streams.append(stream)
+        return stream
+
+    def _unsubscribe(self, stream):
+        with self.lock:
+            if stream in self.streams:
+                self.streams.remove(stream)
+
+    def wants(self, kind):
+        with self.lock:
+            return bool(self.listeners[kind]) or any(stream.wants(kind) for stream in self.streams)
+
+    def emit(self, kind, **payload):
+        event = {"type": kind, "time": time.time(), **payload}
+        with self.lock:
+            listeners = list(self.listeners[kind])
+            streams = [stream for stream in self.streams if stream.wants(kind)]
+        for callback in listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"❌ Error in {kind} listener: {e}")
+        for stream in streams:
+            stream.push(event)
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            raise RuntimeError("Detection is already running")
+        self.stop_requested.clear()
+        self.thread = threading.Thread(target=self._run, name="detection-engine", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_requested.set()
+
+    def wait(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return not self.running
+
+    def _run(self):
+        try:
+            self._detect(time.perf_counter())
+        except Exception as e:
+            print(f"❌ Detection error: {e}")
+            self.emit("status", state="error", message=f"❌ Terjadi kesalahan: {e}")
+        finally:
+            self.emit("stopped", stats=[stat.summary() for stat in self.stats])
+
+    def _detect(self, pressed_at):
+        # Everything _detect_with acquires registers its release here, so an error at any
+        # point still closes the camera, the Hands graph, the recorder and the sinks
+        with ExitStack() as cleanup:
+            self._detect_with(cleanup, pressed_at)
+
+    def _detect_with(self, cleanup, pressed_at):
+        session = self.session
+        metrics = self.metrics
+        try:
+            get_model()  # Already warm when the app pre-loaded it; embedders get it loaded here, off the UI thread
+        except Exception as e:
+            print(f"❌ Failed to load model: {e}")
+            self.emit("status", state="error", message=f"❌ Model gagal dimuat: {e}")
+            return
+        self.emit("status", state="starting", message="🔄 Model dimuat. Memulai deteksi...")
+        cap = open_source(self.source, settings.capture, self.realtime)
+        cleanup.callback(cap.release)
+        if not cap.open():
+            self.emit("status", state="error", message="❌ Kamera tidak ditemukan!")
+            return
+        ret, test_frame, _ = cap.read()
+        if not ret:
+            self.emit("status", state="error", message="❌ Kamera tidak ditemukan!")
+            return
+        H, W, _ = test_frame.shape
+        print(f"📷 {cap.describe()}")
+        capture_status = {"capture": f"{W}x{H} @ {cap.fps:.0f} fps", "capture_latency_ms": 0.0}
+
+        hands = acquire_hands()
+        cleanup.callback(release_hands, hands)
+        status = settings.status[self] = {}  # This run's entry on the Pengaturan status card
+        cleanup.callback(settings.status.pop, self, None)
+        governor = FrameGovernor(status=status)
+        output_fps = settings.governor["target_fps"]
+
+        self.emit("status", state="running", message="🔄 Deteksi dimulai...", width=W, height=H)
+
+        # Frames live in pooled buffers sized from the first capture: BGR for the camera,
+        # RGB for everything after it (MediaPipe, overlay, virtual cam and preview share one conversion)
+        capture_pool = FramePool(test_frame.shape)
+        rgb_pool = FramePool(test_frame.shape)
+        feature_buffer = np.zeros(FEATURE_LENGTH, dtype=np.float32)
+        first_prediction = [None]
+        roi = RoiTracker()
+        subtitles = SubtitleRenderer()
+        last_detection = [None, None, None]  # results, predicted character, probabilities
+        last_sentence = [session.constructed_sentence]
+        recorder = LandmarkRecorder(self.record_path, W, H) if self.record_path else None
+        if recorder:
+            def close_recorder():
+                recorder.close()
+                print(f"🎞️ {recorder.frames} frames of landmarks recorded to {recorder.path}")
+            cleanup.callback(close_recorder)
+        failed = [None]  # The error that stopped the process stage, if any
+        drawing = []  # MediaPipe's drawing utilities, resolved when the first hand shows up
+
+        def draw_hands(frame, multi_hand_landmarks):
+            if not drawing:
+                import mediapipe as mp
+                style = mp.solutions.drawing_utils.DrawingSpec(color=(255, 0, 0))  # Red, in RGB order
+                drawing[:] = [mp.solutions.drawing_utils, mp.solutions.hands.HAND_CONNECTIONS, style]
+            utils, connections, style = drawing
+            for hand_landmarks in multi_hand_landmarks:
+                utils.draw_landmarks(frame, hand_landmarks, connections, style)
+
+        def process_frame(packet):
+            """Landmark detection, classification and subtitle overlay for the newest frame."""
+            started = time.perf_counter()
+            t = metrics.start()
+            # How long the frame waited after capture: driver hand-off, grab slot and queue
+            latency = started - packet.captured_at
+            if metrics.enabled:
+                metrics.record("capture_to_process", latency)
+            capture_status["capture_latency_ms"] += LATENCY_SMOOTHING * (latency * 1000 - capture_status["capture_latency_ms"])
+            status.update(capture_status)
+            captured = packet.frame
+            frame = rgb_pool.acquire()
+            cv2.cvtColor(captured, cv2.COLOR_BGR2RGB, dst=frame)
+            cv2.flip(frame, 1, dst=frame)
+            if packet.on_release:
+                packet.on_release(captured)  # Only pooled captures go back to their pool
+            packet.frame = frame
+            packet.on_release = rgb_pool.release
+            detect = governor.should_detect() or last_detection[0] is None
+            loaded = get_model()  # Read per frame so a model swapped in from Pengaturan takes effect
+
+            if detect:
+                detection_input, region = roi.prepare(frame)
+                t = metrics.lap("convert", t)
+                results = hands.process(detection_input)
+                t = metrics.lap("hands.process", t)
+                roi.map_back(results, region, frame.shape)
+                roi.update(results, frame.shape)
+                predicted_character = None
+                proba = None
+            else:
+                # Under load the governor skips detection; reuse the last landmarks and prediction
+                results, predicted_character, proba = last_detection
+                metrics.count("detection_skipped")
+            hand_present = bool(results.multi_hand_landmarks)
+
+            if hand_present:
+                draw_hands(frame, results.multi_hand_landmarks)
+                if detect:
+                    hand_features(results.multi_hand_landmarks, feature_buffer)
+                    t = metrics.lap("features", t)
+                    characters, probas = loaded.predict_with_proba(feature_buffer[np.newaxis])
+                    predicted_character, proba = characters[0], probas[0]
+                    t = metrics.lap("predict", t)
+                    if first_prediction[0] is None:
+                        first_prediction[0] = time.perf_counter() - pressed_at
+                        print(f"⏱️ Time to first prediction: {first_prediction[0] * 1000:.0f} ms")
+                        startup.mark("first prediction")
+                        startup.report()
+            if detect:
+                last_detection[:] = [results, predicted_character, proba]
+                self.emit(
+                    "prediction", index=packet.index, hand=hand_present, character=predicted_character,
+                    confidence=float(proba.max()) if proba is not None else None
+                )
+
+            now = time.time()
+            if recorder:
+                recorder.write(now, results.multi_hand_landmarks)  # Replayable without camera or MediaPipe
+            if session.advance_sentence(hand_present, predicted_character, now, proba, loaded.class_labels):
+                exceeded = subtitles.draw(frame, session.constructed_sentence)
+                if exceeded:
+                    session.reset_subtitle()
+            if session.constructed_sentence != last_sentence[0]:
+                last_sentence[0] = session.constructed_sentence
+                self.emit("subtitle", text=last_sentence[0])
+            metrics.lap("overlay", t)
+
+            governor.record_process(time.perf_counter() - started, detect)
+            return True
+
+        preview = PreviewEncoder()
+        metrics_due = [0.0]
+
+        def update_preview(packet):
+            # Hand the latest frame to preview listeners, at the rate the governor currently allows
+            started = time.perf_counter()
+            t = metrics.start()
+            if metrics.enabled and time.perf_counter() >= metrics_due[0] and self.wants("metrics"):
+                metrics_due[0] = time.perf_counter() + 1.0
+                update_queue_counters()
+                self.emit("metrics", hud=metrics.format_hud(), snapshot=metrics.snapshot())
+            if not self.wants("preview"):
+                return
+            if preview.fps != governor.preview_fps:
+                preview.set_fps(governor.preview_fps)
+            encoded = preview.encode(packet.frame, packet.index, rgb=True)
+            if encoded is None:
+                metrics.count("preview_skipped")
+                return
+            t = metrics.lap("preview.encode", t)
+            self.emit("preview", index=packet.index, format=preview.fmt, image=encoded)
+            metrics.lap("preview.listeners", t)
+            governor.record_preview(time.perf_counter() - started)
+
+        sinks = [CallbackSink("preview", update_preview)]
+        if self.use_virtual_cam:
+            sinks.append(VirtualCamSink(output_fps))
+        if self.video_path:
+            sinks.append(FileSink(self.video_path, output_fps))
+        self.sinks = open_sinks(sinks + self.extra_sinks, W, H, output_fps)
+
+        def close_outputs():
+            close_sinks(self.sinks)
+            self.sinks = []
+        cleanup.callback(close_outputs)
+
+        def timed(sink):
+            def send(packet):
+                t = metrics.start()
+                sink.send(packet)
+                metrics.lap(f"{sink.name}.send", t)
+            return send
+
+        # capture -> process -> every sink, each joined by a drop-oldest queue so a slow
+        # stage only ever skips frames instead of backing up the camera or the other sinks.
+        capture_queue = LatestQueue()
+        output_queues = [LatestQueue() for _ in self.sinks]
+        capture_stats = StageStats("capture")
+        stage_stats = [StageStats("process")] + [StageStats(sink.name) for sink in self.sinks]
+        self.stats = [capture_stats] + stage_stats
+
+        def process_failed(name, error):
+            # Nothing downstream gets frames any more, so end the run instead of capturing for nobody
+            print(f"❌ Detection error: {error}")
+            failed[0] = error
+            self.emit("status", state="error", message=f"❌ Terjadi kesalahan: {error}")
+            self.stop_requested.set()
+
+        def output_failed(name, error):
+            print(f"⚠️ Output {name} stopped: {error}")
+
+        threads = []
+
+        def stop_pipeline():
+            capture_queue.close()
+            for thread in threads:
+                thread.join()
+        cleanup.callback(stop_pipeline)
+
+        threads.append(start_stage("process", capture_queue, process_frame, output_queues, stage_stats[0], process_failed))
+        for sink, queue, stats in zip(self.sinks, output_queues, stage_stats[1:]):
+            send = timed(sink) if sink.name != "preview" else sink.send  # The preview does its own timing
+            if sink.fps:
+                threads.append(start_paced_stage(sink.name, queue, send, sink.fps, stats, output_failed))
+            else:
+                threads.append(start_stage(sink.name, queue, send, [], stats, output_failed))
+
+        def update_queue_counters():
+            metrics.set_counter("dropped_at_capture", getattr(cap, "dropped", 0))  # Threaded grab only
+            metrics.set_counter("dropped_before_process", capture_queue.dropped)
+            for sink, queue in zip(self.sinks, output_queues):
+                metrics.set_counter(f"dropped_before_{sink.name}", queue.dropped)
+
+        frame_index = 0
+        while not self.stop_requested.is_set():
+            started = time.perf_counter()
+            buffer = capture_pool.acquire()
+            ret, frame, captured_at = cap.read(buffer)
+            if not ret:
+                capture_pool.release(buffer)
+                break
+            capture_stats.record(time.perf_counter() - started, 0.0)
+            metrics.lap("capture", started)
+            if frame is not buffer:
+                # The source didn't fill the pooled buffer (e.g. the driver changed the frame
+                # size); scale into it so every packet in flight stays pooled
+                frame = cv2.resize(frame, (W, H), dst=buffer)
+            capture_queue.put(FramePacket(frame_index, frame, captured_at, capture_pool.release))
+            frame_index += 1
+
+        cleanup.close()  # Stops the stages, then closes outputs, recorder, Hands and camera in that order
+        print(f"📊 {format_stats(self.stats)}")
+        if metrics.enabled:
+            update_queue_counters()
+            if METRICS_FILE:
+                metrics.export(METRICS_FILE)
+                print(f"📊 Metrics written to {METRICS_FILE}")
+        if capture_pool.allocated + rgb_pool.allocated > 2 * POOL_SIZE:
+            print(f"⚠️ Frame pools grew to {capture_pool.allocated} + {rgb_pool.allocated} buffers.")
+        if failed[0] is None:
+            self.emit("status", state="stopped", message="⏹️ Deteksi dihentikan.")
@@ -0,0 +1,57 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+FEATURE_LENGTH = NUM_LANDMARKS * 2 * 2  # x/y for up to two hands
+
+
+def landmarks_to_array(multi_hand_landmarks):
+    """Converts MediaPipe `multi_hand_landmarks` into a (hands, landmarks, 2) float32 array of x/y."""
+    return np.array(
+        [[(lm.x, lm.y) for lm in hand_landmarks.landmark] for hand_landmarks in multi_hand_landmarks],
+        dtype=np.float32,
+    ).reshape(len(multi_hand_landmarks), -1, 2)
+
+
+def extract_features(coords, out=None):
+    """
+    Builds the classifier input from a (hands, landmarks, 2) array into `out`, a float32
+    buffer of FEATURE_LENGTH that is reused across frames when given.
+
+    Matches the original per-point loop: each hand is offset by the minimum x/y over
+    that hand and all hands before it, coordinates are interleaved as x, y, and the
+    vector is zero-padded or truncated to FEATURE_LENGTH.
+    """
+    if out is None:
+        out = np.empty(FEATURE_LENGTH, dtype=np.float32)
+    if len(coords) == 0:
+        out[:] = 0
+        return out
+    mins = np.minimum.accumulate(coords.min(axis=1), axis=0)
+    flat = (coords - mins[:, None, :]).reshape(-1)
+    n = min(flat.size, out.size)
+    out[:n] = flat[:n]
+    out[n:] = 0
+    return out
+
+
+def hand_features(multi_hand_landmarks, out=None):
+    return extract_features(landmarks_to_array(multi_hand_landmarks), out)
+
+
+def extract_features_batch(coords, counts):
+    """
+    Vectorised `extract_features` for many frames at once: `coords` is a
+    (frames, max hands, landmarks, 2) array and `counts` the number of valid hands per
+    frame (slots past the count are ignored). Returns (frames, FEATURE_LENGTH) float32.
+    """
+    coords = np.asarray(coords, dtype=np.float32)
+    counts = np.asarray(counts)
+    frames, max_hands = coords.shape[:2]
+    valid = np.arange(max_hands)[np.newaxis, :] < counts[:, np.newaxis]
+    mins = np.where(valid[:, :, np.newaxis], coords.min(axis=2), np.inf)
+    mins = np.minimum.accumulate(mins, axis=1)
+    flat = np.where(valid[:, :, np.newaxis, np.newaxis], coords - mins[:, :, np.newaxis, :], 0).reshape(frames, -1)
+    out = np.zeros((frames, FEATURE_LENGTH), dtype=np.float32)
+    n = min(flat.shape[1], FEATURE_LENGTH)
+    out[:, :n] = flat[:, :n]
+    return out
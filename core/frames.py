@@ -0,0 +1,31 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+POOL_SIZE = 8  # Buffers allocated up front; more are added only if every buffer is still in use
+
+
+class FramePool:
+    """
+    Preallocated frame buffers of one shape, handed out and returned explicitly so the
+    capture-to-output path reuses the same memory instead of allocating every frame.
+    """
+
+    def __init__(self, shape, size=POOL_SIZE, dtype=np.uint8):
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.free = deque(np.empty(self.shape, dtype=dtype) for _ in range(size))
+        self.allocated = size
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            if self.free:
+                return self.free.pop()
+            self.allocated += 1
+        return np.empty(self.shape, dtype=self.dtype)
+
+    def release(self, buffer):
+        with self.lock:
+            self.free.append(buffer)
@@ -0,0 +1,98 @@
+import time
+
+from core import settings
+
+HIGH_LOAD = 0.85  # Shed load above this fraction of the frame budget
+RESTORE_LOAD = 0.7  # Restore quality when the restored settings are predicted to stay below this
+ADJUST_EVERY = 15  # Frames between two adjustments, so each change can take effect
+SMOOTHING = 0.1  # Weight of the newest sample in the cost averages
+
+
+class FrameGovernor:
+    """
+    Adapts the work done per frame to the machine's speed.
+
+    Measures how much of each frame's time budget (1 / target_fps) the processing
+    and preview stages use. Under pressure it first lowers the preview rate, then
+    runs MediaPipe/classification only on every N-th frame (other frames reuse the
+    last landmarks). With headroom it restores detection first, then the preview.
+    """
+
+    def __init__(self, policy=None, status=None):
+        self.policy = policy if policy is not None else settings.governor
+        self.status = status if status is not None else {}  # Where publish() writes the effective rates
+        self.detect_cost = 0.0
+        self.reuse_cost = 0.0
+        self.preview_cost = 0.0
+        self.stride = 1
+        self.preview_fps = self.policy["max_preview_fps"]
+        self.frames_since_adjust = 0
+        self.frame_index = 0
+        self.rates = {}
+        self.rate_started = time.perf_counter()
+        self.counts = {"processed": 0, "detected": 0}
+
+    def should_detect(self):
+        """True when this frame should run MediaPipe and the classifier."""
+        return not self.policy["enabled"] or self.frame_index % self.stride == 0
+
+    def load(self, stride=None, preview_fps=None):
+        """Predicted fraction of one second of CPU per second the pipeline needs at the given settings."""
+        stride = stride or self.stride
+        preview_fps = self.preview_fps if preview_fps is None else preview_fps
+        per_frame = (self.detect_cost + (stride - 1) * self.reuse_cost) / stride
+        return per_frame * self.policy["target_fps"] + self.preview_cost * preview_fps
+
+    def record_process(self, seconds, detected):
+        if detected:
+            self.detect_cost += SMOOTHING * (seconds - self.detect_cost)
+        else:
+            self.reuse_cost += SMOOTHING * (seconds - self.reuse_cost)
+        self.frame_index += 1
+        self.counts["processed"] += 1
+        self.counts["detected"] += int(detected)
+        self.frames_since_adjust += 1
+        if self.frames_since_adjust >= ADJUST_EVERY:
+            self.frames_since_adjust = 0
+            self.adjust()
+        self.publish()
+
+    def record_preview(self, seconds):
+        self.preview_cost += SMOOTHING * (seconds - self.preview_cost)
+
+    def adjust(self):
+        policy = self.policy
+        if not policy["enabled"]:
+            self.stride = 1
+            self.preview_fps = policy["max_preview_fps"]
+            return
+        self.stride = min(max(self.stride, 1), policy["max_detection_stride"])
+        if self.load() > HIGH_LOAD:
+            # Shed the preview first, detection only once the preview is at its floor
+            if self.preview_fps > policy["min_preview_fps"]:
+                self.preview_fps = max(policy["min_preview_fps"], self.preview_fps // 2)
+            elif self.stride < policy["max_detection_stride"]:
+                self.stride += 1
+        elif self.stride > 1:
+            if self.load(stride=self.stride - 1) < RESTORE_LOAD:
+                self.stride -= 1
+        elif self.preview_fps < policy["max_preview_fps"]:
+            restored = min(policy["max_preview_fps"], self.preview_fps * 2)
+            if self.load(preview_fps=restored) < RESTORE_LOAD:
+                self.preview_fps = restored
+
+    def publish(self):
+        """Updates `status` about once per second with the effective rates."""
+        now = time.perf_counter()
+        elapsed = now - self.rate_started
+        if elapsed < 1.0:
+            return
+        self.status.update({
+            "process_fps": self.counts["processed"] / elapsed,
+            "detection_fps": self.counts["detected"] / elapsed,
+            "preview_fps_cap": self.preview_fps,
+            "detection_stride": self.stride,
+            "load": self.load(),
+        })
+        self.counts = {"processed": 0, "detected": 0}
+        self.rate_started = now
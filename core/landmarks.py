@@ -0,0 +1,157 @@
+"""
+Landmark recordings: the per-frame MediaPipe output of a live session in a compact
+binary log, and a replay that feeds it straight into feature extraction, the
+classifier and the sentence logic with no camera or MediaPipe involved.
+
+File layout: a 32-byte header (magic, format version, floats per record, frame
+width and height), then one fixed-size float32 record per frame:
+
+    [seconds since the recording started, hands detected, 2 x 21 x (x, y, z)]
+
+Unused hand slots are zero. Fixed-size records let a recording be memory-mapped
+as one (frames, 128) array.
+
+    python -m core.landmarks info session.lmk
+    python -m core.landmarks replay session.lmk --decoder confidence --repeat 20
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from core.features import NUM_LANDMARKS, extract_features_batch
+
+MAGIC = b"BISLMK\x00\x00"
+FORMAT_VERSION = 1
+MAX_HANDS = 2
+RECORD_FLOATS = 2 + MAX_HANDS * NUM_LANDMARKS * 3
+_HEADER = struct.Struct("<8sIIII8x")  # 32 bytes, keeps the records float32-aligned
+
+
+class LandmarkRecorder:
+    """Appends one record per processed frame; call `close()` to flush the file."""
+
+    def __init__(self, path, width=0, height=0):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_FLOATS, width, height))
+        self.record = np.zeros(RECORD_FLOATS, dtype=np.float32)
+        self.hands = self.record[2:].reshape(MAX_HANDS, NUM_LANDMARKS, 3)
+        self.started = None
+        self.frames = 0
+
+    def write(self, timestamp, multi_hand_landmarks):
+        """Records MediaPipe's `multi_hand_landmarks` (None or empty when no hand was found)."""
+        if self.started is None:
+            self.started = timestamp
+        hands = (multi_hand_landmarks or [])[:MAX_HANDS]
+        self.record[0] = timestamp - self.started
+        self.record[1] = len(hands)
+        self.hands[:] = 0
+        for slot, hand_landmarks in enumerate(hands):
+            self.hands[slot] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+        self.file.write(self.record.tobytes())
+        self.frames += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class LandmarkRecording:
+    """A recording memory-mapped for reading."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, floats, self.width, self.height = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version > FORMAT_VERSION or floats != RECORD_FLOATS:
+            raise ValueError(f"{path} is not a supported landmark recording")
+        self.path = path
+        if os.path.getsize(path) == _HEADER.size:
+            self.records = np.zeros((0, RECORD_FLOATS), dtype=np.float32)  # Nothing recorded; mmap can't map zero bytes
+        else:
+            self.records = np.memmap(path, dtype=np.float32, mode="r", offset=_HEADER.size).reshape(-1, RECORD_FLOATS)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def timestamps(self):
+        return self.records[:, 0]
+
+    @property
+    def hand_counts(self):
+        return self.records[:, 1].astype(np.int64)
+
+    @property
+    def landmarks(self):
+        """(frames, MAX_HANDS, 21, 3) view of every record's landmark slots."""
+        return self.records[:, 2:].reshape(-1, MAX_HANDS, NUM_LANDMARKS, 3)
+
+    def features(self):
+        """Classifier inputs for every frame, built exactly as the live loop builds them."""
+        return extract_features_batch(self.landmarks[:, :, :, :2], self.hand_counts)
+
+
+def replay(recording, decoder=None, width=None, height=None):
+    """
+    Runs a recording through feature extraction, prediction and the live sentence
+    logic at full speed. Returns (finished sentences, per-frame predicted characters).
+    """
+    from core.offline import TranscriptBuilder
+    from core.registry import get_model
+
+    present = recording.hand_counts > 0
+    features = recording.features()
+    characters = [None] * len(recording)
+    probas = [None] * len(recording)
+    rows = np.flatnonzero(present)
+    if len(rows):
+        labels, proba = get_model().predict_with_proba(features[rows])
+        for row, character, row_proba in zip(rows, labels, proba):
+            characters[row] = character
+            probas[row] = row_proba
+    builder = TranscriptBuilder(width or recording.width, height or recording.height, decoder)
+    for timestamp, hand_present, character, proba in zip(recording.timestamps, present, characters, probas):
+        builder.step(float(timestamp), bool(hand_present), character, proba)
+    return builder.finish(), characters
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Inspect or replay BISINDO landmark recordings.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info_parser = commands.add_parser("info", help="Summarise a recording")
+    info_parser.add_argument("recording")
+    replay_parser = commands.add_parser("replay", help="Rebuild the transcript without camera or MediaPipe")
+    replay_parser.add_argument("recording")
+    replay_parser.add_argument("--decoder", choices=("vote", "confidence"), help="Default: settings.sentence")
+    replay_parser.add_argument("--repeat", type=int, default=1, help="Replay N times and report the speed")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    recording = LandmarkRecording(args.recording)
+    duration = float(recording.timestamps[-1]) if len(recording) else 0.0
+    if args.command == "info":
+        print(f"🎞️ {len(recording)} frames, {duration:.1f} s, {recording.width}x{recording.height}, "
+              f"hands in {int((recording.hand_counts > 0).sum())} frames")
+        return 0
+
+    from core.registry import get_model
+    get_model()
+    started = time.perf_counter()
+    for _ in range(max(args.repeat, 1)):
+        sentences, _ = replay(recording, args.decoder)
+    elapsed = (time.perf_counter() - started) / max(args.repeat, 1)
+    for sentence in sentences:
+        print(f"💬 {sentence}")
+    print(f"⏱️ {len(recording)} frames ({duration:.1f} s of footage) replayed in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
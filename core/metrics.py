@@ -0,0 +1,98 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+METRICS_ENABLED = os.environ.get("BISINDO_METRICS") == "1"
+METRICS_FILE = os.environ.get("BISINDO_METRICS_FILE")  # .json or .csv written when detection stops
+METRICS_WINDOW = 300  # Samples kept per stage for the rolling percentiles
+
+
+class Metrics:
+    """
+    Hot-path stage timers with rolling p50/p95/p99 and frame counters.
+    When disabled, `start`/`lap` return immediately and nothing is stored.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, window=METRICS_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def start(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def lap(self, name, started):
+        """Records the time since `started` under `name` and returns the new start time."""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self.record(name, now - started)
+        return now
+
+    def record(self, name, seconds):
+        samples = self.samples.get(name)
+        if samples is None:
+            with self.lock:
+                samples = self.samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_counter(self, name, value):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = value
+
+    def snapshot(self):
+        """Returns {"stages": {name: {...ms}}, "counters": {...}} computed from the current windows."""
+        with self.lock:
+            stages = {name: list(samples) for name, samples in self.samples.items()}
+            counters = dict(self.counters)
+        summary = {}
+        for name, values in stages.items():
+            if not values:
+                continue
+            p50, p95, p99 = np.percentile(np.asarray(values) * 1000, [50, 95, 99])
+            summary[name] = {
+                "samples": len(values),
+                "mean_ms": float(np.mean(values) * 1000),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+            }
+        return {"stages": summary, "counters": counters}
+
+    def format_hud(self):
+        snapshot = self.snapshot()
+        lines = [
+            f"{name}: {s['p50_ms']:.1f} / {s['p95_ms']:.1f} / {s['p99_ms']:.1f} ms"
+            for name, s in snapshot["stages"].items()
+        ]
+        counters = ", ".join(f"{name} {value}" for name, value in snapshot["counters"].items())
+        if counters:
+            lines.append(counters)
+        return "p50 / p95 / p99\n" + "\n".join(lines)
+
+    def export(self, path):
+        snapshot = self.snapshot()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["stage", "samples", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+                for name, s in snapshot["stages"].items():
+                    writer.writerow([name, s["samples"], s["mean_ms"], s["p50_ms"], s["p95_ms"], s["p99_ms"]])
+                for name, value in snapshot["counters"].items():
+                    writer.writerow([name, value, "", "", "", ""])
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
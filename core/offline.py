@@ -0,0 +1,469 @@
+"""
+Headless recognizer for recorded footage.
+
+    python -m core.offline session.mp4 -o predictions.jsonl
+    python -m core.offline frames_dir/ -o predictions.csv --fps 30
+    python -m core.offline archive/*.mp4 -o predictions.jsonl --workers 8
+
+Runs the same landmark, feature, classifier and sentence logic as the Mulai page
+without Flet or the virtual camera, and reports the achieved frames per second.
+With --workers, recordings are split into chunks that are processed by a pool of
+processes and merged back into the same transcript the sequential run produces.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from core.engine import create_hands
+from core.features import FEATURE_LENGTH, hand_features
+from core.registry import get_model
+from core.roi import RoiTracker
+from core.subtitle import SubtitleRenderer
+from core.session import DetectionSession, DECODERS
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def list_images(source):
+    return sorted(n for n in os.listdir(source) if n.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def count_frames(source):
+    if os.path.isdir(source):
+        return len(list_images(source))
+    cap = cv2.VideoCapture(source)
+    try:
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+
+
+def iter_frames(source, fps=None, start=0, stop=None):
+    """
+    Yields (index, timestamp, BGR frame) from a video file or a directory of images, for
+    frames [start, stop). Videos seek to `start` first; the position is read back because
+    a backend may land on an earlier keyframe, and the frames in between are decoded and
+    discarded so indices stay exact at chunk boundaries.
+    """
+    if os.path.isdir(source):
+        names = list_images(source)
+        fps = fps or 30.0
+        for index in range(start, len(names) if stop is None else min(stop, len(names))):
+            frame = cv2.imread(os.path.join(source, names[index]))
+            if frame is not None:
+                yield index, index / fps, frame
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {source}")
+    fps = fps or cap.get(cv2.CAP_PROP_FPS) or 30.0
+    try:
+        index = seek(cap, source, start)
+        if index is None:
+            return
+        while stop is None or index < stop:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield index, index / fps, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+def seek(cap, source, start):
+    """
+    Positions `cap` on frame `start` and returns it, or None when the video ends first.
+    Falls back to decoding from the beginning when the backend can't seek or reports a
+    position past `start`.
+    """
+    index = 0
+    if start > 0 and cap.set(cv2.CAP_PROP_POS_FRAMES, start):
+        landed = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if 0 <= landed <= start:
+            index = landed
+        else:
+            cap.open(source)
+    while index < start:
+        if not cap.grab():  # Decodes without converting the frame
+            return None
+        index += 1
+    return index
+
+
+def detect_batch(hands, frames, flip=True, roi=None):
+    """Runs MediaPipe over a batch of frames; returns a hand mask and a (n, FEATURE_LENGTH) feature matrix."""
+    features = np.zeros((len(frames), FEATURE_LENGTH), dtype=np.float32)
+    present = np.zeros(len(frames), dtype=bool)
+    roi = roi or RoiTracker(enabled=False, scale=1.0)
+    for row, frame in enumerate(frames):
+        if flip:
+            frame = cv2.flip(frame, 1)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        detection_input, region = roi.prepare(frame_rgb)
+        results = hands.process(detection_input)
+        roi.map_back(results, region, frame.shape)
+        roi.update(results, frame.shape)
+        if results.multi_hand_landmarks:
+            present[row] = True
+            hand_features(results.multi_hand_landmarks, features[row])
+    return present, features
+
+
+def classify_batch(present, features):
+    """Classifies only the rows with a hand; other rows get None for both the label and the probabilities."""
+    characters = [None] * len(present)
+    probas = [None] * len(present)
+    rows = np.flatnonzero(present)
+    if len(rows):
+        labels, proba = get_model().predict_with_proba(features[rows])
+        for row, character, row_proba in zip(rows, labels, proba):
+            characters[row] = character
+            probas[row] = row_proba
+    return characters, probas
+
+
+class TranscriptBuilder:
+    """Replays per-frame predictions through the live sentence logic and collects finished sentences."""
+
+    def __init__(self, width, height, decoder=None):
+        self.width = width
+        self.height = height
+        self.subtitles = SubtitleRenderer()
+        self.session = DetectionSession(decoder=decoder)
+        self.labels = get_model().class_labels
+        self.sentences = []
+        self.current = ""
+
+    def step(self, timestamp, hand_present, character, proba=None):
+        if self.session.advance_sentence(hand_present, character, timestamp, proba, self.labels):
+            if self.subtitles.layout(self.session.constructed_sentence, self.width, self.height).exceeded:
+                self.session.reset_subtitle()
+        sentence = self.session.constructed_sentence
+        if sentence != self.current:
+            if self.current and not sentence.startswith(self.current):
+                self.sentences.append(self.current)
+            self.current = sentence
+        return sentence
+
+    def finish(self):
+        if self.current:
+            self.sentences.append(self.current)
+            self.current = ""
+        return self.sentences
+
+
+def process_chunk(source, start=0, stop=None, overlap=0, fps=None, flip=True, batch_size=64, use_roi=False, detect_scale=1.0):
+    """
+    Detects and classifies frames [start, stop) of one recording with a fresh Hands
+    instance. The `overlap` frames before `start` are processed only to warm up
+    MediaPipe's tracking state and are left out of the result.
+    Returns ((frame height, width), [(index, timestamp, hand_present, character, proba), ...]).
+    """
+    get_model()
+    hands = create_hands()
+    roi = RoiTracker(enabled=use_roi, scale=detect_scale)
+    size = None
+    records = []
+    batch = []
+    frames = iter_frames(source, fps, max(0, start - overlap), stop)
+    try:
+        while True:
+            batch.clear()
+            for item in frames:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+            if not batch:
+                break
+            size = size or batch[0][2].shape[:2]
+            present, features = detect_batch(hands, [frame for _, _, frame in batch], flip, roi)
+            characters, probas = classify_batch(present, features)
+            for (index, timestamp, _), hand_present, character, proba in zip(batch, present, characters, probas):
+                if index >= start:
+                    records.append((index, timestamp, bool(hand_present), character, proba))
+    finally:
+        hands.close()
+    return size, records
+
+
+def _process_chunk_job(job):
+    return process_chunk(*job)
+
+
+def plan_chunks(source, chunk_frames):
+    """Splits a recording into [start, stop) ranges; the last range runs to the end of the file."""
+    total = count_frames(source)
+    if chunk_frames <= 0 or total <= chunk_frames:
+        return [(0, None)]
+    starts = list(range(0, total, chunk_frames))
+    return [(begin, end) for begin, end in zip(starts, starts[1:] + [None])]
+
+
+def transcribe(sources, workers=1, batch_size=64, fps=None, flip=True, chunk_frames=900, overlap=30,
+               use_roi=False, detect_scale=1.0, decoder=None, on_frame=None):
+    """
+    Processes whole recordings. `on_frame(record)` receives one dict per frame, in order.
+    Detection and classification run in `workers` processes; the sentence logic always
+    runs sequentially here so the transcript matches a single-process run.
+    Returns ({source: sentences}, frame_count, elapsed_seconds).
+    """
+    started = time.perf_counter()
+    if workers <= 1:
+        results = {
+            source: [process_chunk(source, 0, None, 0, fps, flip, batch_size, use_roi, detect_scale)]
+            for source in sources
+        }
+    else:
+        jobs = [
+            (source, begin, end, overlap, fps, flip, batch_size, use_roi, detect_scale)
+            for source in sources
+            for begin, end in plan_chunks(source, chunk_frames)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_process_chunk_job, jobs))
+        results = {source: [] for source in sources}
+        for job, chunk in zip(jobs, chunks):
+            results[job[0]].append(chunk)
+
+    transcripts = {}
+    frame_count = 0
+    for source, chunks in results.items():
+        height, width = next((size for size, _ in chunks if size), (0, 0))
+        builder = TranscriptBuilder(width, height, decoder)
+        for _, records in chunks:
+            for index, timestamp, hand_present, character, proba in records:
+                sentence = builder.step(timestamp, hand_present, character, proba)
+                if on_frame:
+                    on_frame({
+                        "source": source,
+                        "frame": index,
+                        "time": round(timestamp, 4),
+                        "hand": hand_present,
+                        "prediction": character,
+                        "sentence": sentence,
+                    })
+            frame_count += len(records)
+        transcripts[source] = builder.finish()
+    return transcripts, frame_count, time.perf_counter() - started
+
+
+def report_scaling(sources, **kwargs):
+    """
+    Runs the same job with 1, 2, 4 and all cores and prints throughput and speed-up, and
+    whether the chunked runs reproduced the 1-worker frames and transcript exactly.
+    """
+    counts = sorted({n for n in (1, 2, 4, os.cpu_count() or 1) if n <= (os.cpu_count() or 1)})
+    baseline = None
+    reference = None
+    for workers in counts:
+        frames = []
+        transcripts, frame_count, elapsed = transcribe(sources, workers=workers, on_frame=frames.append, **kwargs)
+        fps = frame_count / max(elapsed, 1e-9)
+        baseline = baseline or fps
+        result = ([(f["source"], f["frame"], f["hand"], f["prediction"]) for f in frames], transcripts)
+        reference = reference or result
+        if workers == 1:
+            check = ""
+        elif result == reference:
+            check = ", ✅ same frames and transcript as 1 worker"
+        else:
+            check = ", ⚠️ frames or transcript differ from 1 worker"
+        print(f"📊 {workers} worker(s): {frame_count} frames in {elapsed:.2f} s ({fps:.1f} fps, x{fps / baseline:.2f}){check}")
+
+
+def compare_roi(sources, **kwargs):
+    """Benchmarks ROI tracking / downscaled detection against full-frame processing on the same clips."""
+    baseline = []
+    _, frame_count, elapsed = transcribe(sources, on_frame=baseline.append,
+                                         **dict(kwargs, use_roi=False, detect_scale=1.0))
+    print(f"📊 full frame: {frame_count / max(elapsed, 1e-9):.1f} fps")
+    candidate = []
+    _, frame_count, elapsed = transcribe(sources, on_frame=candidate.append, **kwargs)
+    same_hand = sum(a["hand"] == b["hand"] for a, b in zip(baseline, candidate))
+    same_prediction = sum(a["prediction"] == b["prediction"] for a, b in zip(baseline, candidate))
+    same_sentence = sum(a["sentence"] == b["sentence"] for a, b in zip(baseline, candidate))
+    total = max(len(baseline), 1)
+    print(
+        f"📊 roi={kwargs.get('use_roi')} scale={kwargs.get('detect_scale')}: "
+        f"{frame_count / max(elapsed, 1e-9):.1f} fps, hand agreement {same_hand / total:.1%}, "
+        f"prediction agreement {same_prediction / total:.1%}, sentence agreement {same_sentence / total:.1%}"
+    )
+
+
+def load_references(path, sources):
+    """
+    Reads what was actually signed: a .json file mapping each source (path or file name)
+    to its text, or a text file with one line per source in the order given.
+    Returns {source: [letters]}.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            texts = json.load(f)
+            texts = {source: texts.get(source, texts.get(os.path.basename(source))) for source in sources}
+        else:
+            texts = dict(zip(sources, f.read().splitlines()))
+    missing = [source for source in sources if texts.get(source) is None]
+    if missing:
+        raise ValueError(f"No reference transcript for {', '.join(missing)}")
+    return {source: texts[source].split() for source in sources}
+
+
+def edit_distance(reference, hypothesis):
+    """Levenshtein distance between two letter sequences (substitutions, insertions and deletions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, expected in enumerate(reference, 1):
+        current = [i]
+        for j, actual in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (expected != actual)))
+        previous = current
+    return previous[-1]
+
+
+def compare_decoders(sources, reference=None, **kwargs):
+    """
+    Runs detection once and replays the per-frame results through both sentence decoders.
+    Reports how many frames each letter took to commit after its sign first appeared and,
+    given a `reference` transcript file (see load_references), each decoder's letter
+    error rate: edit distance to what was signed over the number of signed letters.
+    """
+    references = load_references(reference, sources) if reference else None
+    chunks_by_source = {
+        source: [process_chunk(source, 0, None, 0, kwargs.get("fps"), kwargs.get("flip", True),
+                               kwargs.get("batch_size", 64), kwargs.get("use_roi", False),
+                               kwargs.get("detect_scale", 1.0))]
+        for source in sources
+    }
+    for decoder in DECODERS:
+        delays, sentences = [], []
+        errors = 0
+        for source, chunks in chunks_by_source.items():
+            (height, width), records = chunks[0]
+            builder = TranscriptBuilder(width, height, decoder)
+            onset = None
+            previous = ""
+            for index, timestamp, hand_present, character, proba in records:
+                if character is not None and (onset is None or character != onset[1]):
+                    onset = (index, character)
+                sentence = builder.step(timestamp, hand_present, character, proba)
+                if sentence != previous and sentence.startswith(previous) and onset:
+                    delays.append(index - onset[0])
+                previous = sentence
+            finished = builder.finish()
+            sentences.extend(finished)
+            if references:
+                errors += edit_distance(references[source], " ".join(finished).split())
+        mean_delay = sum(delays) / len(delays) if delays else float("nan")
+        summary = f"📊 {decoder}: {len(delays)} letters, {mean_delay:.1f} frames from sign onset to commit"
+        if references:
+            signed = sum(len(letters) for letters in references.values())
+            summary += f", letter error rate {errors / max(signed, 1):.1%} ({errors} edits / {signed} letters)"
+        print(summary)
+        for sentence in sentences:
+            print(f"   📝 {sentence}")
+
+
+class PredictionWriter:
+    """Writes per-frame records to JSONL or CSV depending on the file extension."""
+
+    FIELDS = ["source", "frame", "time", "hand", "prediction", "sentence"]
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.csv = None
+        if path.lower().endswith(".csv"):
+            self.csv = csv.DictWriter(self.file, fieldnames=self.FIELDS)
+            self.csv.writeheader()
+
+    def write(self, record):
+        if self.csv:
+            self.csv.writerow(record)
+        else:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write_sentences(self, source, sentences):
+        if not self.csv:
+            self.file.write(json.dumps({"source": source, "sentences": sentences}, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run BISINDO recognition over video files or image folders.")
+    parser.add_argument("sources", nargs="+", help="Video files or directories of frames")
+    parser.add_argument("-o", "--output", help="Per-frame predictions (.jsonl or .csv)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Frames classified per batch")
+    parser.add_argument("--fps", type=float, help="Frame rate used for timestamps (default: from the video, or 30)")
+    parser.add_argument("--no-flip", action="store_true", help="Do not mirror frames like the live camera does")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used for detection (default: 1)")
+    parser.add_argument("--chunk-frames", type=int, default=900, help="Frames per chunk when splitting one recording")
+    parser.add_argument("--overlap", type=int, default=30, help="Warm-up frames processed before each chunk")
+    parser.add_argument("--scaling", action="store_true", help="Report throughput for 1, 2, 4 and all cores")
+    parser.add_argument("--roi", action="store_true", help="Crop MediaPipe's input around the tracked hand")
+    parser.add_argument("--detect-scale", type=float, default=1.0, help="Downscale factor for MediaPipe's input")
+    parser.add_argument("--decoder", choices=DECODERS,
+                        help="Sentence decoder: fixed-window vote or streaming confidence (default: settings.sentence)")
+    parser.add_argument("--compare-decoders", action="store_true",
+                        help="Compare commit latency, transcripts and (with --reference) error rate of both decoders")
+    parser.add_argument("--reference", help="What was signed, for --compare-decoders: a .json {source: text} "
+                                            "or a text file with one line per source")
+    parser.add_argument("--compare-roi", action="store_true",
+                        help="Compare --roi/--detect-scale against full-frame detection (speed and agreement)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = dict(
+        batch_size=args.batch_size,
+        fps=args.fps,
+        flip=not args.no_flip,
+        chunk_frames=args.chunk_frames,
+        overlap=args.overlap,
+        use_roi=args.roi,
+        detect_scale=args.detect_scale,
+        decoder=args.decoder,
+    )
+    if args.compare_decoders:
+        compare_decoders(args.sources, args.reference, **options)
+        return 0
+    if args.compare_roi:
+        compare_roi(args.sources, workers=args.workers, **options)
+        return 0
+    if args.scaling:
+        report_scaling(args.sources, **options)
+        return 0
+
+    writer = PredictionWriter(args.output) if args.output else None
+    try:
+        transcripts, frame_count, elapsed = transcribe(
+            args.sources,
+            workers=args.workers,
+            on_frame=writer.write if writer else None,
+            **options,
+        )
+        if writer:
+            for source, sentences in transcripts.items():
+                writer.write_sentences(source, sentences)
+    finally:
+        if writer:
+            writer.close()
+
+    for source, sentences in transcripts.items():
+        for sentence in sentences:
+            print(f"📝 {os.path.basename(source)}: {sentence}")
+    print(f"📊 {frame_count} frames in {elapsed:.2f} s ({frame_count / max(elapsed, 1e-9):.1f} fps)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
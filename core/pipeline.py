@@ -0,0 +1,213 @@
+import threading
+import time
+from collections import deque
+
+
+class LatestQueue:
+    """Bounded queue that drops the oldest item when full, so consumers always see the newest frame."""
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self.items = deque()
+        self.dropped = 0
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) >= self.maxsize:
+                self._drop(self.items.popleft())
+            self.items.append(item)
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        """Returns the next item, or None once the queue is closed and drained."""
+        with self.cond:
+            while not self.items and not self.closed:
+                if not self.cond.wait(timeout):
+                    return None
+            return self.items.popleft() if self.items else None
+
+    def poll(self):
+        """Returns the newest item without waiting, or None when nothing new has arrived."""
+        with self.cond:
+            item = None
+            while self.items:
+                if item is not None:
+                    self._drop(item)
+                item = self.items.popleft()
+            return item
+
+    def _drop(self, item):
+        # Every item skipped for a newer one is counted here, whichever call replaced it
+        item.release()
+        self.dropped += 1
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class FramePacket:
+    """
+    A captured frame travelling through the pipeline together with its timing.
+
+    Whoever holds the packet holds one reference. When the last reference is
+    released, `on_release(frame)` hands a pooled buffer back to its FramePool.
+    """
+
+    __slots__ = ("index", "frame", "captured_at", "data", "refs", "on_release")
+
+    _lock = threading.Lock()
+
+    def __init__(self, index, frame, captured_at, on_release=None):
+        self.index = index
+        self.frame = frame
+        self.captured_at = captured_at
+        self.data = {}
+        self.refs = 1
+        self.on_release = on_release
+
+    def retain(self, count=1):
+        with self._lock:
+            self.refs += count
+
+    def release(self):
+        with self._lock:
+            self.refs -= 1
+            done = self.refs == 0
+        if done and self.on_release:
+            self.on_release(self.frame)
+
+
+class StageStats:
+    """Throughput and latency counters for one pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.busy_time = 0.0
+        self.latency_total = 0.0
+        self.last_latency = 0.0
+        self.queue = None  # The LatestQueue feeding this stage, for its drop count
+        self.started_at = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def record(self, busy, latency):
+        with self.lock:
+            self.count += 1
+            self.busy_time += busy
+            self.latency_total += latency
+            self.last_latency = latency
+
+    def summary(self):
+        with self.lock:
+            elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+            count = max(self.count, 1)
+            return {
+                "stage": self.name,
+                "frames": self.count,
+                "fps": self.count / elapsed,
+                "busy_ms": self.busy_time / count * 1000,
+                "latency_ms": self.latency_total / count * 1000,
+                "last_latency_ms": self.last_latency * 1000,
+                "dropped": self.queue.dropped if self.queue else 0,
+            }
+
+
+def _report_error(name, error):
+    print(f"❌ Error in pipeline stage {name}: {error}")
+
+
+def start_stage(name, source, handler, sinks, stats, on_error=_report_error):
+    """
+    Runs `handler(packet)` for every packet taken from `source` on its own thread.
+    A truthy return forwards the packet to every queue in `sinks`; when the source
+    closes, the sinks are closed too so that shutdown ripples down the pipeline.
+    The stage owns one reference to each packet and passes one on to every sink.
+    If the handler raises, the stage stops and calls `on_error(name, error)`.
+    """
+    stats.queue = source
+
+    def worker():
+        try:
+            while True:
+                packet = source.get()
+                if packet is None:
+                    break
+                started = time.perf_counter()
+                try:
+                    forward = handler(packet)
+                except Exception as e:
+                    packet.release()
+                    on_error(name, e)
+                    break
+                finished = time.perf_counter()
+                stats.record(finished - started, finished - packet.captured_at)
+                if forward and sinks:
+                    packet.retain(len(sinks))
+                    for sink in sinks:
+                        sink.put(packet)
+                packet.release()
+        finally:
+            for sink in sinks:
+                sink.close()
+
+    thread = threading.Thread(target=worker, name=f"pipeline-{name}", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_paced_stage(name, source, handler, fps, stats, on_error=_report_error):
+    """
+    Runs `handler(packet)` at a steady `fps` on its own thread, using the newest packet
+    from `source` and repeating the previous one when no new frame arrived in time.
+    Keeps outputs such as the virtual camera at a constant cadence even when
+    processing falls behind. If the handler raises, the stage stops and calls
+    `on_error(name, error)`.
+    """
+    stats.queue = source
+
+    def worker():
+        interval = 1.0 / fps
+        packet = None
+        next_tick = time.perf_counter()
+        while not source.closed:
+            newest = source.poll()
+            if newest is not None:
+                if packet is not None:
+                    packet.release()
+                packet = newest
+            if packet is not None:
+                started = time.perf_counter()
+                try:
+                    handler(packet)
+                except Exception as e:
+                    on_error(name, e)
+                    break
+                finished = time.perf_counter()
+                stats.record(finished - started, finished - packet.captured_at)
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+        if packet is not None:
+            packet.release()
+        leftover = source.poll()
+        if leftover is not None:
+            leftover.release()
+
+    thread = threading.Thread(target=worker, name=f"pipeline-{name}", daemon=True)
+    thread.start()
+    return thread
+
+
+def format_stats(stats):
+    return " | ".join(
+        f"{s['stage']}: {s['fps']:.1f} fps, {s['busy_ms']:.1f} ms busy, {s['latency_ms']:.1f} ms latency"
+        + (f", {s['dropped']} dropped" if s["dropped"] else "")
+        for s in (stat.summary() for stat in stats)
+    )
@@ -0,0 +1,56 @@
+import base64
+import time
+import cv2
+
+# Preview settings (independent from the detection rate and the virtual camera output)
+PREVIEW_FORMAT = ".jpg"  # ".jpg" or ".webp"
+PREVIEW_QUALITY = 75  # 0-100, passed to the JPEG/WebP encoder
+PREVIEW_MAX_WIDTH = 800  # Downscale to the displayed width; None keeps the captured size
+PREVIEW_FPS = 15  # Maximum preview refresh rate
+
+_QUALITY_FLAGS = {
+    ".jpg": cv2.IMWRITE_JPEG_QUALITY,
+    ".jpeg": cv2.IMWRITE_JPEG_QUALITY,
+    ".webp": cv2.IMWRITE_WEBP_QUALITY,
+}
+
+
+class PreviewEncoder:
+    """Encodes frames for the Flet preview at a capped rate, skipping frames that were already sent."""
+
+    def __init__(self, fmt=PREVIEW_FORMAT, quality=PREVIEW_QUALITY, max_width=PREVIEW_MAX_WIDTH, fps=PREVIEW_FPS):
+        if fmt not in _QUALITY_FLAGS:
+            raise ValueError(f"Unsupported preview format: {fmt}")
+        self.fmt = fmt
+        self.params = [_QUALITY_FLAGS[fmt], int(quality)]
+        self.max_width = max_width
+        self.set_fps(fps)
+        self.next_due = 0.0
+        self.last_index = None
+
+    def set_fps(self, fps):
+        self.fps = fps
+        self.interval = 1.0 / fps if fps else 0.0
+
+    def encode(self, frame, index=None, rgb=False):
+        """
+        Returns the frame as a base64 string, or None when it is not due or was already sent.
+        RGB frames are converted after downscaling, so the colour conversion stays small.
+        """
+        now = time.perf_counter()
+        if now < self.next_due or (index is not None and index == self.last_index):
+            return None
+        # Keep a steady cadence, but never try to catch up on slots that were missed entirely
+        base = self.next_due if now - self.next_due < self.interval else now
+        self.next_due = base + self.interval
+        self.last_index = index
+
+        h, w = frame.shape[:2]
+        if self.max_width and w > self.max_width:
+            frame = cv2.resize(frame, (self.max_width, h * self.max_width // w), interpolation=cv2.INTER_AREA)
+        if rgb:
+            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        ok, buffer = cv2.imencode(self.fmt, frame, self.params)
+        if not ok:
+            return None
+        return base64.b64encode(buffer).decode("utf-8")
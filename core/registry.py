@@ -0,0 +1,274 @@
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from core.artifact import load_artifact as load_native, read_header, source_digests
+from core.classifier import compile_model
+from core.features import FEATURE_LENGTH
+
+ARTIFACT_PATH = os.path.join(os.path.dirname(__file__), "../model.npz")  # Native format, loads without sklearn
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "../model.p")
+LABELS_PATH = os.path.join(os.path.dirname(__file__), "../label_dict.json")
+MODELS_DIR = os.path.join(os.path.dirname(__file__), "../models")  # One subdirectory per version: models/<version>/model.npz
+BUNDLED_VERSION = "bundled"  # The model.p / label_dict.json shipped next to main.py
+WATCH_INTERVAL = 5.0  # Seconds between checks for new model versions
+
+_lock = threading.Lock()
+_loaded = None
+_hands_pool = []
+_hands_lock = threading.Lock()
+_stale_warned = set()
+
+
+class LoadedModel:
+    """A classifier and its label map. Shared read-only by every detection session in the process."""
+
+    def __init__(self, classifier, labels, version=BUNDLED_VERSION):
+        self.classifier = classifier
+        self.labels = labels
+        self.version = version
+        self.class_labels = [labels.get(str(int(c)), "Unknown") for c in classifier.classes_]
+
+    def predict_characters(self, features):
+        """Classifies a (n, FEATURE_LENGTH) batch of feature vectors into label characters."""
+        predictions = self.classifier.predict(features)
+        return [self.labels.get(str(int(p)), "Unknown") for p in predictions]
+
+    def predict_proba(self, features):
+        """Class probabilities in `class_labels` order; one-hot for models without probabilities."""
+        if self.classifier.kind == "forest":
+            return self.classifier.predict_proba(features)
+        predictions = self.classifier.predict(features)
+        return (self.classifier.classes_[np.newaxis, :] == predictions[:, np.newaxis]).astype(np.float64)
+
+    def predict_with_proba(self, features):
+        """Labels and probabilities from a single classifier pass when the model supports it."""
+        if self.classifier.kind != "forest":
+            return self.predict_characters(features), self.predict_proba(features)
+        proba = self.classifier.predict_proba(features)
+        return [self.class_labels[i] for i in np.argmax(proba, axis=1)], proba
+
+
+class ModelValidationError(ValueError):
+    """A model artifact that cannot be used for live detection."""
+
+
+class ModelArtifact:
+    """
+    A model on disk, identified by a version string: either a native .npz artifact,
+    which carries its labels, or a legacy model.p pickle with a label_dict.json.
+    """
+
+    def __init__(self, version, model_path, labels_path=None):
+        self.version = version
+        self.model_path = model_path
+        self.labels_path = labels_path
+
+    def stamp(self):
+        """Changes whenever a file is rewritten, so an updated version is picked up again."""
+        return tuple(os.stat(path).st_mtime_ns for path in (self.model_path, self.labels_path) if path)
+
+    def __repr__(self):
+        return f"ModelArtifact({self.version!r})"
+
+
+def _version_order(version):
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"(\d+)", version) if part]
+
+
+def _built_from(artifact_path, model_path, labels_path):
+    """Whether the artifact's header records exactly these pickle and label files as its source."""
+    try:
+        return read_header(artifact_path).get("source") == source_digests(model_path, labels_path)
+    except (OSError, ValueError):
+        return False
+
+
+def _find_artifact(version, directory, artifact_name="model.npz", model_name="model.p", labels_name="label_dict.json"):
+    """
+    Prefers the native artifact in `directory`, falling back to a pickle plus label map.
+    When both are present the artifact is only used if it was built from that pickle and
+    label map, so editing model.p or label_dict.json is never silently ignored.
+    """
+    artifact_path = os.path.join(directory, artifact_name)
+    model_path = os.path.join(directory, model_name)
+    labels_path = os.path.join(directory, labels_name)
+    has_pickle = os.path.isfile(model_path) and os.path.isfile(labels_path)
+    if os.path.isfile(artifact_path):
+        if not has_pickle or _built_from(artifact_path, model_path, labels_path):
+            return ModelArtifact(version, artifact_path)
+        if artifact_path not in _stale_warned:
+            _stale_warned.add(artifact_path)
+            print(f"⚠️ {artifact_path} is out of date with {model_name} / {labels_name}, loading those instead. "
+                  f"Rebuild it with: python -m core.artifact {model_path} -o {artifact_path} --labels {labels_path}")
+    if has_pickle:
+        return ModelArtifact(version, model_path, labels_path)
+    return None
+
+
+def discover_models(models_dir=None):
+    """
+    Lists usable-looking artifacts, oldest first: the bundled model, then every
+    models/<version>/ directory holding model.npz (or model.p and label_dict.json),
+    in natural version order (v2 < v10).
+    """
+    models_dir = models_dir or MODELS_DIR
+    artifacts = []
+    bundled = _find_artifact(BUNDLED_VERSION, os.path.dirname(ARTIFACT_PATH), os.path.basename(ARTIFACT_PATH),
+                             os.path.basename(MODEL_PATH), os.path.basename(LABELS_PATH))
+    if bundled:
+        artifacts.append(bundled)
+    if os.path.isdir(models_dir):
+        versions = [_find_artifact(name, os.path.join(models_dir, name)) for name in os.listdir(models_dir)]
+        artifacts.extend(sorted(filter(None, versions), key=lambda artifact: _version_order(artifact.version)))
+    return artifacts
+
+
+def validate_model(loaded):
+    """Rejects models that would break live detection: wrong input size or classes without a label."""
+    n_features = loaded.classifier.n_features_in_
+    if n_features != FEATURE_LENGTH:
+        raise ModelValidationError(f"model {loaded.version} expects {n_features} features, not {FEATURE_LENGTH}")
+    missing = [int(c) for c in loaded.classifier.classes_ if str(int(c)) not in loaded.labels]
+    if missing:
+        raise ModelValidationError(f"model {loaded.version} has classes without labels: {missing}")
+    return loaded
+
+
+def load_from_disk(model_path=MODEL_PATH, labels_path=LABELS_PATH, version=BUNDLED_VERSION):
+    if model_path.endswith(".npz"):
+        classifier, labels, _ = load_native(model_path)
+        return LoadedModel(classifier, labels, version)
+    import pickle  # Legacy pickles need sklearn importable to unpickle
+    with open(model_path, "rb") as f:
+        model_dict = pickle.load(f)
+    with open(labels_path, "r") as f:
+        labels = json.load(f)
+    # NumPy fast path, same labels as sklearn
+    return LoadedModel(compile_model(model_dict["model"]), labels, version)
+
+
+def load_artifact(artifact):
+    """Loads, validates and warms one artifact; the first prediction allocates the classifier's scratch memory."""
+    loaded = validate_model(load_from_disk(artifact.model_path, artifact.labels_path, artifact.version))
+    loaded.predict_with_proba(np.zeros((1, FEATURE_LENGTH), dtype=np.float32))
+    return loaded
+
+
+def _load_newest(artifacts):
+    """Loads the newest artifact that validates, falling back to older ones."""
+    errors = []
+    for artifact in reversed(artifacts):
+        try:
+            return artifact, load_artifact(artifact)
+        except Exception as e:
+            print(f"⚠️ Skipping model {artifact.version}: {e}")
+            errors.append(f"{artifact.version}: {e}")
+    raise FileNotFoundError("No usable model found. " + "; ".join(errors))
+
+
+def get_model():
+    """Returns the process-wide model, loading the newest valid version on first use."""
+    global _loaded
+    if _loaded is None:
+        with _lock:
+            if _loaded is None:
+                _, _loaded = _load_newest(discover_models())
+    return _loaded
+
+
+def is_loaded():
+    return _loaded is not None
+
+
+def current_version():
+    return _loaded.version if _loaded is not None else None
+
+
+def swap_model(version=None):
+    """
+    Loads a model version (the newest valid one when `version` is None) on the calling
+    thread and then replaces the shared model in one assignment. Detection reads the
+    model once per frame, so the switch lands between frames without stopping the
+    camera. Returns the new model; raises and keeps the current one if loading fails.
+    """
+    global _loaded
+    artifacts = discover_models()
+    if version is not None:
+        artifacts = [artifact for artifact in artifacts if artifact.version == version]
+        if not artifacts:
+            raise FileNotFoundError(f"Model version {version} not found")
+    _, loaded = _load_newest(artifacts)
+    with _lock:
+        _loaded = loaded
+    print(f"🔁 Model switched to version {loaded.version}.")
+    return loaded
+
+
+def swap_model_in_background(version=None, on_done=None):
+    """Runs `swap_model` on a daemon thread; `on_done(model, error)` reports the outcome."""
+    def worker():
+        try:
+            loaded, error = swap_model(version), None
+        except Exception as e:
+            loaded, error = None, e
+            print(f"❌ Model reload failed: {e}")
+        if on_done:
+            on_done(loaded, error)
+
+    thread = threading.Thread(target=worker, name="model-reload", daemon=True)
+    thread.start()
+    return thread
+
+
+def watch_models(interval=WATCH_INTERVAL):
+    """
+    Polls for new or rewritten model versions and swaps the newest one in when it
+    appears. A version picked by hand stays active until the newest artifact changes.
+    Returns a threading.Event; set it to stop watching.
+    """
+    stop = threading.Event()
+    seen = [None]  # What the newest artifact looked like at the last check
+
+    def newest_stamp():
+        artifacts = discover_models()
+        if not artifacts:
+            return None
+        try:
+            return artifacts[-1].version, artifacts[-1].stamp()
+        except OSError:
+            return None  # Caught mid-write; look again on the next tick
+
+    seen[0] = newest_stamp()
+
+    def worker():
+        while not stop.wait(interval):
+            stamp = newest_stamp()
+            if _loaded is None or stamp is None or stamp == seen[0]:
+                continue
+            seen[0] = stamp  # A broken artifact is not retried until it changes on disk
+            try:
+                swap_model(stamp[0])
+            except Exception as e:
+                print(f"❌ Model {stamp[0]} rejected: {e}")
+
+    threading.Thread(target=worker, name="model-watch", daemon=True).start()
+    return stop
+
+
+def acquire_hands():
+    """Takes a warmed MediaPipe Hands graph from the pool, building one only when the pool is empty."""
+    with _hands_lock:
+        if _hands_pool:
+            return _hands_pool.pop()
+    from core.engine import create_hands
+    return create_hands()
+
+
+def release_hands(hands):
+    """Returns a Hands graph to the pool so the next start/stop cycle can reuse it."""
+    with _hands_lock:
+        _hands_pool.append(hands)
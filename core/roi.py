@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+
+from core import settings
+
+ROI_MARGIN = 0.35  # Extra space around the hand, as a fraction of the hand's size
+ROI_MIN_SIZE = 0.25  # Smallest crop, as a fraction of the frame's shorter side
+ROI_REFRESH_FRAMES = 30  # Run on the full frame this often to pick up hands outside the crop
+
+
+class RoiTracker:
+    """
+    Chooses the image MediaPipe sees for each frame: a crop around the last hand
+    bounding box when tracking, otherwise the full frame, optionally downscaled.
+    Landmarks found in a crop are mapped back to full-frame coordinates so drawing
+    and feature extraction behave exactly as with full-frame detection.
+    `enabled` and `scale` default to settings.detection.
+    """
+
+    def __init__(self, enabled=None, margin=ROI_MARGIN, min_size=ROI_MIN_SIZE,
+                 refresh_frames=ROI_REFRESH_FRAMES, scale=None):
+        self.enabled = settings.detection["roi"] if enabled is None else enabled
+        self.margin = margin
+        self.min_size = min_size
+        self.refresh_frames = refresh_frames
+        self.scale = settings.detection["scale"] if scale is None else scale
+        self.box = None
+        self.frames_since_full = 0
+
+    def prepare(self, frame_rgb):
+        """Returns (detection input, region) where region is the (x, y, w, h) crop in full-frame pixels."""
+        H, W = frame_rgb.shape[:2]
+        use_roi = self.enabled and self.box is not None and self.frames_since_full < self.refresh_frames
+        if use_roi:
+            x0, y0, x1, y1 = self.box
+            image = np.ascontiguousarray(frame_rgb[y0:y1, x0:x1])  # MediaPipe needs contiguous input
+            region = (x0, y0, x1 - x0, y1 - y0)
+            self.frames_since_full += 1
+        else:
+            image = frame_rgb
+            region = (0, 0, W, H)
+            self.frames_since_full = 0
+        if self.scale < 1.0:
+            image = cv2.resize(image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return image, region
+
+    def map_back(self, results, region, frame_shape):
+        """Rewrites normalised landmark coordinates from the crop to the full frame, in place."""
+        H, W = frame_shape[:2]
+        x0, y0, w, h = region
+        if not results.multi_hand_landmarks or (x0, y0, w, h) == (0, 0, W, H):
+            return
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = (x0 + lm.x * w) / W
+                lm.y = (y0 + lm.y * h) / H
+
+    def update(self, results, frame_shape):
+        """Tracks the union of all hands for the next frame, or falls back to the full frame when lost."""
+        if not self.enabled:
+            return
+        if not results.multi_hand_landmarks:
+            self.box = None
+            return
+        H, W = frame_shape[:2]
+        xs = [lm.x for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in results.multi_hand_landmarks for lm in hand.landmark]
+        cx, cy = (min(xs) + max(xs)) / 2 * W, (min(ys) + max(ys)) / 2 * H
+        size = max((max(xs) - min(xs)) * W, (max(ys) - min(ys)) * H) * (1 + 2 * self.margin)
+        size = min(max(size, self.min_size * min(W, H)), min(W, H))
+        x0 = int(min(max(cx - size / 2, 0), W - size))
+        y0 = int(min(max(cy - size / 2, 0), H - size))
+        self.box = (x0, y0, x0 + int(size), y0 + int(size))
@@ -0,0 +1,191 @@
+"""
+Local WebSocket server for the detection engine, so tools other than the Flet app
+(overlays, captioning bots, recorders) can consume the recognizer.
+
+    python -m core.server serve --source 0
+    python -m core.server serve --source clip.mp4 --no-virtual-cam
+    python -m core.server serve --source synthetic --width 1280 --height 720
+    python -m core.server listen ws://127.0.0.1:8765/?preview=1
+
+Each client receives the engine's events as JSON text messages (see core.engine).
+Preview frames are only sent to clients that ask for them, with `?preview=1` in the
+URL or by sending {"type": "subscribe", "preview": true}. Every client has its own
+bounded buffer: a client that reads too slowly loses its oldest events without
+holding back the engine or the other clients.
+
+Needs the optional `websockets` package (pip install websockets).
+"""
+import argparse
+import asyncio
+import json
+import sys
+from urllib.parse import parse_qs, urlparse
+
+from core import settings
+from core.engine import DetectionEngine, EVENTS, STREAM_SIZE, ENABLE_VIRTUAL_CAM
+from core.session import DetectionSession, DECODERS
+
+HOST = "127.0.0.1"  # Local clients only by default
+PORT = 8765
+SHUTDOWN_GRACE = 2.0  # Seconds clients get to receive the final events after the engine stops
+
+
+def _import_websockets():
+    try:
+        import websockets
+    except ImportError:
+        raise SystemExit("❌ The WebSocket server needs the 'websockets' package: pip install websockets")
+    return websockets
+
+
+def _client_kinds(preview):
+    return set(EVENTS) if preview else set(EVENTS) - {"preview"}
+
+
+async def handle_client(engine, websocket, buffer_size=STREAM_SIZE):
+    """Streams engine events to one client until either side goes away."""
+    websockets = _import_websockets()
+    request = getattr(websocket, "request", None)
+    path = request.path if request is not None else getattr(websocket, "path", "")
+    query = parse_qs(urlparse(path).query)
+    stream = engine.events(_client_kinds(query.get("preview", ["0"])[0] == "1"), buffer_size)
+
+    async def receive():
+        async for message in websocket:
+            try:
+                request = json.loads(message)
+            except ValueError:
+                continue
+            if request.get("type") == "subscribe":
+                stream.kinds = _client_kinds(bool(request.get("preview")))
+
+    receiver = asyncio.create_task(receive())
+    try:
+        await websocket.send(json.dumps({
+            "type": "hello",
+            "running": engine.running,
+            "sentence": engine.session.constructed_sentence,
+            "events": sorted(stream.kinds),
+        }))
+        async for event in stream:
+            # send() waits while the client's socket is backed up; meanwhile the
+            # stream keeps only the newest events for this client
+            await websocket.send(json.dumps(event))
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        stream.close()
+        receiver.cancel()
+        if stream.dropped:
+            print(f"⚠️ Client fell behind, {stream.dropped} events dropped.")
+
+
+async def serve(engine, host=HOST, port=PORT, buffer_size=STREAM_SIZE):
+    """Runs the engine and serves its events until the engine stops."""
+    websockets = _import_websockets()
+    clients = set()
+
+    async def handler(websocket, *_):
+        task = asyncio.current_task()
+        clients.add(task)
+        try:
+            await handle_client(engine, websocket, buffer_size)
+        finally:
+            clients.discard(task)
+
+    async with websockets.serve(handler, host, port):
+        print(f"📡 Streaming detection events on ws://{host}:{port}")
+        engine.start()
+        await asyncio.get_running_loop().run_in_executor(None, engine.wait)
+        if clients:
+            await asyncio.wait(list(clients), timeout=SHUTDOWN_GRACE)
+
+
+async def listen(url, show_preview=False):
+    """Minimal client: prints the events a server sends."""
+    websockets = _import_websockets()
+    async with websockets.connect(url, max_size=None) as websocket:
+        async for message in websocket:
+            event = json.loads(message)
+            kind = event["type"]
+            if kind == "preview":
+                if show_preview:
+                    print(f"🖼️ frame {event['index']}: {len(event['image'])} bytes")
+            elif kind == "prediction":
+                if event["character"] is not None:
+                    print(f"🖐️ frame {event['index']}: {event['character']} ({event['confidence']:.2f})")
+            elif kind == "subtitle":
+                print(f"💬 {event['text']}")
+            elif kind == "status":
+                print(event["message"])
+            elif kind == "stopped":
+                for stage in event["stats"]:
+                    print(f"📊 {stage['stage']}: {stage['frames']} frames, {stage['fps']:.1f} fps")
+                return
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve BISINDO detection events over a local WebSocket.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run detection and stream its events")
+    serve_parser.add_argument("--source", help="Camera index, video file or 'synthetic' (default: settings.capture)")
+    serve_parser.add_argument("--width", type=int, help="Requested capture width")
+    serve_parser.add_argument("--height", type=int, help="Requested capture height")
+    serve_parser.add_argument("--fps", type=int, help="Requested capture frame rate")
+    serve_parser.add_argument("--mjpg", action="store_true", help="Ask the camera for Motion JPEG")
+    serve_parser.add_argument("--no-threaded-capture", action="store_true", help="Read the camera on the capture loop itself")
+    serve_parser.add_argument("--host", default=HOST)
+    serve_parser.add_argument("--port", type=int, default=PORT)
+    serve_parser.add_argument("--buffer", type=int, default=STREAM_SIZE, help="Events buffered per client")
+    serve_parser.add_argument("--roi", action="store_true", help="Crop MediaPipe's input around the tracked hand")
+    serve_parser.add_argument("--detect-scale", type=float, help="Downscale factor for MediaPipe's input (default: settings.detection)")
+    serve_parser.add_argument("--decoder", choices=DECODERS, help="Sentence decoder (default: settings.sentence)")
+    serve_parser.add_argument("--no-virtual-cam", action="store_true", help="Don't open the OBS virtual camera")
+    serve_parser.add_argument("--fast", action="store_true", help="Read video files as fast as possible")
+    serve_parser.add_argument("--record", help="Also write a landmark recording (see core.landmarks)")
+    serve_parser.add_argument("--record-video", help="Also record the subtitled output (.mp4 or .avi)")
+
+    listen_parser = commands.add_parser("listen", help="Print the events of a running server")
+    listen_parser.add_argument("url", nargs="?", default=f"ws://{HOST}:{PORT}/")
+    listen_parser.add_argument("--preview", action="store_true", help="Also receive preview frames")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "listen":
+        url = args.url
+        if args.preview and "preview=" not in url:
+            url += ("&" if "?" in url else "?") + "preview=1"
+        asyncio.run(listen(url, args.preview))
+        return 0
+
+    from core.registry import get_model
+    get_model()  # Predictions start with the first frame instead of after a lazy load
+    for key in ("width", "height", "fps"):
+        if getattr(args, key) is not None:
+            settings.capture[key] = getattr(args, key)
+    settings.capture["mjpg"] = settings.capture["mjpg"] or args.mjpg
+    settings.capture["threaded"] = settings.capture["threaded"] and not args.no_threaded_capture
+    settings.detection["roi"] = settings.detection["roi"] or args.roi
+    if args.detect_scale is not None:
+        settings.detection["scale"] = args.detect_scale
+    engine = DetectionEngine(
+        DetectionSession(decoder=args.decoder),
+        source=args.source,
+        virtual_cam=ENABLE_VIRTUAL_CAM and not args.no_virtual_cam,
+        realtime=not args.fast,
+        record_path=args.record,
+        video_path=args.record_video,
+    )
+    try:
+        asyncio.run(serve(engine, args.host, args.port, args.buffer))
+    except KeyboardInterrupt:
+        engine.stop()
+        engine.wait(5)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import time
+from collections import deque, Counter
+
+from core import settings
+from core.decoder import ConfidenceDecoder
+
+SUBTITLE_TIMEOUT = 3  # Seconds the subtitle stays visible after the hand leaves the frame
+DECODERS = ("vote", "confidence")
+
+
+class DetectionSession:
+    """
+    Sentence-building state for one detection stream (one page, one web session or one recording).
+    The decoder and its parameters default to settings.sentence at construction.
+    """
+
+    def __init__(self, word_delay=None, buffer_size=None, subtitle_timeout=SUBTITLE_TIMEOUT, decoder=None, policy=None):
+        policy = policy if policy is not None else settings.sentence
+        decoder = decoder or policy["decoder"]
+        # Buffer for predictions to construct sentences
+        self.prediction_buffer = deque(maxlen=buffer_size or policy["buffer_size"])
+        self.constructed_sentence = ""
+        self.word_delay = word_delay or policy["word_delay"]
+        self.subtitle_timeout = subtitle_timeout
+        self.frame_counter = 0
+        self.last_detection_time = time.time()
+        self.hand_detected = False
+        self.decoder = ConfidenceDecoder(
+            commit_threshold=policy["commit_threshold"], release_threshold=policy["release_threshold"]
+        ) if decoder == "confidence" else None
+
+    def reset_subtitle(self):
+        self.constructed_sentence = ""
+        self.prediction_buffer.clear()
+        self.frame_counter = 0
+        self.hand_detected = False
+        if self.decoder:
+            self.decoder.reset()
+
+    def append_word(self, word):
+        if word == "Unknown":
+            return
+        if not self.constructed_sentence or word != self.constructed_sentence.split()[-1]:
+            self.constructed_sentence += (" " + word) if self.constructed_sentence else word
+
+    def update_sentence(self):
+        if len(self.prediction_buffer) == self.prediction_buffer.maxlen:
+            self.append_word(Counter(self.prediction_buffer).most_common(1)[0][0])
+        self.prediction_buffer.clear()
+        self.frame_counter = 0
+
+    def advance_sentence(self, hand_present, predicted_character, now, proba=None, labels=None):
+        """
+        Feeds one frame's detection result into the sentence builder. With the confidence
+        decoder, `proba` and the matching `labels` drive the decision instead of the vote.
+        Returns True while the subtitle should stay on screen.
+        """
+        if hand_present:
+            if not self.hand_detected:
+                self.reset_subtitle()
+            self.hand_detected = True
+            self.last_detection_time = now
+            if predicted_character is not None and not self.decoder:
+                self.prediction_buffer.append(predicted_character)
+
+        if self.decoder:
+            word = self.decoder.step(proba if hand_present else None, labels)
+            if word is not None:
+                self.append_word(word)
+        else:
+            self.frame_counter += 1
+            if self.frame_counter >= self.word_delay:
+                self.update_sentence()
+
+        if self.hand_detected and now - self.last_detection_time < self.subtitle_timeout:
+            return True
+        self.reset_subtitle()
+        return False
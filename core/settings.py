@@ -0,0 +1,40 @@
+# Runtime settings shared by the detection loop and the Pengaturan page.
+# The page edits these dictionaries in place; the loop reads them every frame.
+
+governor = {
+    "enabled": True,  # Shed load automatically when frames take longer than the budget
+    "target_fps": 30,  # Output cadence of the virtual camera and the detection budget
+    "max_detection_stride": 3,  # Run MediaPipe/classification at least every N-th frame
+    "min_preview_fps": 5,  # Preview is throttled down to this before detection is skipped
+    "max_preview_fps": 15,  # Preview rate when there is headroom
+}
+
+# MediaPipe's input (see core.roi), read when detection starts
+detection = {
+    "roi": False,  # Crop MediaPipe's input around the last detected hand
+    "scale": 1.0,  # Downscale factor for MediaPipe's input (1.0 keeps the captured size)
+}
+
+# Sentence construction (see core.session and core.decoder), read when a session starts
+sentence = {
+    "decoder": "vote",  # "vote": majority over fixed windows, "confidence": streaming ConfidenceDecoder
+    "word_delay": 10,  # Vote: frames before adding a new word
+    "buffer_size": 10,  # Vote: predictions voted on for each word
+    "commit_threshold": 0.5,  # Confidence: smoothed confidence needed to emit a letter
+    "release_threshold": 0.3,  # Confidence: the emitted letter must fall below this before the next one
+}
+
+# Capture settings, applied when detection starts (see core.capture). 0 keeps the driver default.
+capture = {
+    "source": 0,  # Camera index, video file path or "synthetic"
+    "width": 0,  # Requested resolution; MediaPipe gains little above 640x480
+    "height": 0,
+    "fps": 0,  # Requested camera frame rate
+    "mjpg": False,  # Ask for Motion JPEG, which many USB cameras need for 720p+ at full rate
+    "buffer_size": 1,  # Frames the driver may queue; 1 keeps latency lowest
+    "threaded": True,  # Grab on a separate thread and always process the newest frame
+}
+
+# Effective rates published by each running detection engine, keyed by engine; an
+# engine removes only its own entry when it stops
+status = {}
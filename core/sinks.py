@@ -0,0 +1,137 @@
+"""
+Output sinks for the detection engine. Every sink runs on its own pipeline thread
+behind a drop-oldest queue and receives the same processed RGB frame, so a slow
+sink only skips frames for itself and never holds back detection or other sinks.
+
+A sink with `fps` set runs paced (repeating the last frame when processing falls
+behind, which keeps cameras and files at a constant rate); with `fps` None it
+handles each new frame as it arrives.
+"""
+import os
+
+import cv2
+import numpy as np
+
+RECORD_FPS = 30
+_FOURCC = {".mp4": "mp4v", ".avi": "MJPG", ".mjpg": "MJPG", ".mkv": "MJPG"}
+
+
+class Sink:
+    name = "sink"
+    fps = None
+
+    def open(self, width, height, fps):
+        """Called once the frame size is known; raise to leave the sink out of this run."""
+
+    def send(self, packet):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NullSink(Sink):
+    """Discards frames; counts them so benchmarks can see what reached the output."""
+
+    name = "null"
+
+    def __init__(self, fps=None):
+        self.fps = fps
+        self.frames = 0
+
+    def send(self, packet):
+        self.frames += 1
+
+
+class CallbackSink(Sink):
+    """Hands each frame to a function, e.g. the engine's preview encoder."""
+
+    def __init__(self, name, callback, fps=None):
+        self.name = name
+        self.callback = callback
+        self.fps = fps
+
+    def send(self, packet):
+        self.callback(packet)
+
+
+class VirtualCamSink(Sink):
+    """OBS Virtual Camera through pyvirtualcam, fed the RGB frame directly."""
+
+    name = "virtual_cam"
+
+    def __init__(self, fps=None):
+        self.fps = fps
+        self.camera = None
+
+    def open(self, width, height, fps):
+        import pyvirtualcam  # OBS Virtual Camera, only needed for live output
+        self.fps = self.fps or fps
+        self.camera = pyvirtualcam.Camera(width=width, height=height, fps=self.fps, fmt=pyvirtualcam.PixelFormat.RGB)
+        print(f"✅ Virtual Camera started! Resolution: {width}x{height}")
+
+    def send(self, packet):
+        # No sleep_until_next_frame: the paced stage already keeps the cadence
+        self.camera.send(packet.frame)
+
+    def close(self):
+        if self.camera is not None:
+            self.camera.close()
+            self.camera = None
+            print("❌ Virtual Camera stopped.")
+
+
+class FileSink(Sink):
+    """
+    Records the subtitled output with OpenCV: MP4 (mp4v) for .mp4, Motion JPEG for
+    .avi/.mkv. Paced, so the file plays back at real speed even when frames are skipped.
+    """
+
+    name = "recorder"
+
+    def __init__(self, path, fps=RECORD_FPS, fourcc=None):
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.writer = None
+        self.buffer = None
+        self.frames = 0
+
+    def open(self, width, height, fps):
+        extension = os.path.splitext(self.path)[1].lower()
+        fourcc = cv2.VideoWriter_fourcc(*(self.fourcc or _FOURCC.get(extension, "MJPG")))
+        self.writer = cv2.VideoWriter(self.path, fourcc, self.fps, (width, height))
+        if not self.writer.isOpened():
+            raise RuntimeError(f"Cannot write video to {self.path}")
+        self.buffer = np.empty((height, width, 3), dtype=np.uint8)  # Writers take BGR; converted on this thread only
+
+    def send(self, packet):
+        cv2.cvtColor(packet.frame, cv2.COLOR_RGB2BGR, dst=self.buffer)
+        self.writer.write(self.buffer)
+        self.frames += 1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+            print(f"🎬 {self.frames} frames recorded to {self.path}")
+
+
+def open_sinks(sinks, width, height, fps):
+    """Opens every sink, leaving out (with a warning) the ones that can't start here."""
+    opened = []
+    for sink in sinks:
+        try:
+            sink.open(width, height, fps)
+            opened.append(sink)
+        except Exception as e:
+            print(f"⚠️ Output {sink.name} disabled: {e}")
+    return opened
+
+
+def close_sinks(sinks):
+    for sink in sinks:
+        try:
+            sink.close()
+        except Exception as e:
+            print(f"❌ Error closing output {sink.name}: {e}")
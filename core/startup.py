@@ -0,0 +1,58 @@
+"""
+Start-up profiler. Enable with BISINDO_PROFILE_STARTUP=1 or `python main.py --profile-startup`.
+
+Records how long each newly imported module takes (inclusive of the modules it pulls in)
+and the time from process start to milestones such as the first paint and the first
+prediction. Only the standard library is used so importing this module stays cheap.
+"""
+import builtins
+import os
+import sys
+import threading
+import time
+
+STARTED_AT = time.perf_counter()
+ENABLED = os.environ.get("BISINDO_PROFILE_STARTUP") == "1" or "--profile-startup" in sys.argv
+
+import_times = {}
+milestones = {}
+_original_import = builtins.__import__
+_lock = threading.Lock()
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    started = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            import_times.setdefault(name, elapsed)
+
+
+def enable():
+    builtins.__import__ = _timed_import
+
+
+def mark(name):
+    """Records the first time a milestone is reached and prints it."""
+    if not ENABLED or name in milestones:
+        return
+    milestones[name] = time.perf_counter() - STARTED_AT
+    print(f"⏱️ {name}: {milestones[name] * 1000:.0f} ms since start")
+
+
+def report(limit=15):
+    if not ENABLED:
+        return
+    with _lock:
+        slowest = sorted(import_times.items(), key=lambda item: item[1], reverse=True)[:limit]
+    print("⏱️ Slowest imports (inclusive):")
+    for name, elapsed in slowest:
+        print(f"   {elapsed * 1000:8.1f} ms  {name}")
+
+
+if ENABLED:
+    enable()
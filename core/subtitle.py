@@ -0,0 +1,83 @@
+import cv2
+
+# Adjustable variables
+RECTANGLE_MARGIN_BOTTOM = 120  # Controls the margin from the bottom of the frame
+TEXT_SIZE = 1.0  # Controls the size of the subtitle text
+TEXT_THICKNESS = 2  # Controls text thickness
+LINE_SPACING = 40  # Controls spacing between lines
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def wrap_text(text, max_width, font_scale, thickness):
+    words = text.split()
+    lines = []
+    current_line = ""
+
+    for word in words:
+        test_line = current_line + (" " if current_line else "") + word
+        text_size = cv2.getTextSize(test_line, FONT, font_scale, thickness)[0]
+        if text_size[0] > max_width:
+            lines.append(current_line)
+            current_line = word
+            if len(lines) >= 2:  # Maximum of two lines
+                return lines, True
+        else:
+            current_line = test_line
+
+    lines.append(current_line)
+    return lines, False
+
+
+class SubtitleLayout:
+    """Wrapped lines and pixel geometry of one subtitle at one frame size."""
+
+    def __init__(self, sentence, width, height, font_scale, thickness, line_spacing, margin_bottom):
+        self.lines, self.exceeded = wrap_text(sentence, width - 100, font_scale, thickness)
+        text_width = max(cv2.getTextSize(line, FONT, font_scale, thickness)[0][0] for line in self.lines) + 40
+        bg_height = len(self.lines) * line_spacing + 30
+        y = height - margin_bottom - (len(self.lines) - 1) * line_spacing
+        x = (width - text_width) // 2
+        self.rect = (x, y, x + text_width, y + bg_height)
+        self.origins = [(x + 20, y + 45 + i * line_spacing) for i in range(len(self.lines))]
+        # Blend only this region; a small border covers the anti-aliased rectangle edge
+        self.roi = (max(x - 2, 0), max(y - 2, 0), min(x + text_width + 3, width), min(y + bg_height + 3, height))
+
+
+class SubtitleRenderer:
+    """
+    Draws the subtitle box and text onto frames. The layout (wrapping and text
+    measurement) is cached and rebuilt only when the sentence or frame size changes,
+    and the translucent box is blended over its own region instead of the full frame.
+    Output is pixel-identical to copying and blending the whole frame.
+    """
+
+    def __init__(self, font_scale=TEXT_SIZE, thickness=TEXT_THICKNESS, line_spacing=LINE_SPACING,
+                 margin_bottom=RECTANGLE_MARGIN_BOTTOM):
+        self.font_scale = font_scale
+        self.thickness = thickness
+        self.line_spacing = line_spacing
+        self.margin_bottom = margin_bottom
+        self.key = None
+        self.cached = None
+
+    def layout(self, sentence, width, height):
+        key = (sentence, width, height, self.font_scale, self.thickness, self.line_spacing, self.margin_bottom)
+        if key != self.key:
+            self.cached = SubtitleLayout(sentence, width, height, self.font_scale, self.thickness,
+                                         self.line_spacing, self.margin_bottom)
+            self.key = key
+        return self.cached
+
+    def draw(self, frame, sentence):
+        """Draws the subtitle in place and returns True when the sentence no longer fits in two lines."""
+        H, W = frame.shape[:2]
+        layout = self.layout(sentence, W, H)
+        rx0, ry0, rx1, ry1 = layout.roi
+        x0, y0, x1, y1 = layout.rect
+        region = frame[ry0:ry1, rx0:rx1]
+        overlay = region.copy()
+        cv2.rectangle(overlay, (x0 - rx0, y0 - ry0), (x1 - rx0, y1 - ry0), (0, 0, 0, 180), -1, cv2.LINE_AA)
+        cv2.addWeighted(overlay, 0.7, region, 0.3, 0, region)
+        for line, origin in zip(layout.lines, layout.origins):
+            cv2.putText(frame, line, origin, FONT, self.font_scale, (255, 255, 255), self.thickness, cv2.LINE_AA)
+        return layout.exceeded
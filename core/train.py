@@ -0,0 +1,275 @@
+"""
+Training pipeline: turns a folder of labelled signing data into a model the app loads.
+
+    python -m core.train data/ --version v2
+
+    data/
+        A/   *.lmk landmark recordings (core.landmarks) and/or *.jpg / *.png images
+        B/   ...
+
+Features are the same 84 values the live loop builds. Recordings are converted in
+one vectorised pass; images go through MediaPipe in parallel worker processes.
+Every file's features are cached in data/.feature_cache under the SHA-1 of its
+contents, so after adding a new letter only the new files are processed.
+
+Writes models/<version>/ with model.npz, model.p and label_dict.json. Existing
+letters keep their ids from the newest model's label map (or --labels) and new
+letters get the next free ids. A running app picks the new version up through core.registry.watch_models.
+Training needs scikit-learn; the app itself does not.
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from core.artifact import read_header, save_artifact
+from core.classifier import export_model
+from core.features import FEATURE_LENGTH, hand_features
+from core.landmarks import LandmarkRecording
+from core.registry import MODELS_DIR, discover_models
+
+FEATURE_VERSION = 1  # Bump when feature extraction changes, so old cache entries are ignored
+CACHE_DIRNAME = ".feature_cache"
+RECORDING_EXTENSIONS = (".lmk",)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+_hands = None  # One static-image Hands graph per worker process
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def discover_dataset(root):
+    """Returns sorted (label, path) pairs; each top-level directory of `root` is one label."""
+    items = []
+    for label in sorted(os.listdir(root)):
+        directory = os.path.join(root, label)
+        if label.startswith(".") or not os.path.isdir(directory):
+            continue
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in sorted(filenames):
+                if filename.lower().endswith(RECORDING_EXTENSIONS + IMAGE_EXTENSIONS):
+                    items.append((label, os.path.join(dirpath, filename)))
+    return items
+
+
+def recording_features(path):
+    """Feature rows for every frame of a landmark recording that has a hand."""
+    recording = LandmarkRecording(path)
+    return recording.features()[recording.hand_counts > 0]
+
+
+def _init_image_worker():
+    global _hands
+    from core.engine import create_hands
+    _hands = create_hands(static_image_mode=True)
+
+
+def image_features(path, flip=False):
+    """One feature row for an image with a hand in it, none otherwise."""
+    import cv2
+    image = cv2.imread(path)
+    if image is None:
+        print(f"⚠️ Skipping unreadable image {path}")
+        return np.zeros((0, FEATURE_LENGTH), dtype=np.float32)
+    if flip:
+        image = cv2.flip(image, 1)
+    results = _hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if not results.multi_hand_landmarks:
+        return np.zeros((0, FEATURE_LENGTH), dtype=np.float32)
+    return hand_features(results.multi_hand_landmarks)[np.newaxis].copy()
+
+
+def _image_job(job):
+    return image_features(*job)
+
+
+def extract_dataset(items, cache_dir, workers=None, flip=False):
+    """
+    Features and label names for every file, reading unchanged files from the cache.
+    Returns (X, labels, cache hits, files processed).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    with ThreadPoolExecutor() as pool:
+        digests = list(pool.map(file_hash, [path for _, path in items]))
+
+    def cache_file(path, digest):
+        image_flag = "-flip" if flip and path.lower().endswith(IMAGE_EXTENSIONS) else ""
+        return os.path.join(cache_dir, f"{digest}-v{FEATURE_VERSION}{image_flag}.npy")
+
+    features = [None] * len(items)
+    images = []
+    hits = 0
+    for i, ((_, path), digest) in enumerate(zip(items, digests)):
+        cached = cache_file(path, digest)
+        if os.path.exists(cached):
+            features[i] = np.load(cached)
+            hits += 1
+        elif path.lower().endswith(RECORDING_EXTENSIONS):
+            features[i] = recording_features(path)
+            np.save(cached, features[i])
+        else:
+            images.append(i)
+
+    if images:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_image_worker) as pool:
+            jobs = [(items[i][1], flip) for i in images]
+            for i, rows in zip(images, pool.map(_image_job, jobs, chunksize=16)):
+                features[i] = rows
+                np.save(cache_file(items[i][1], digests[i]), rows)
+
+    labels = [label for (label, _), rows in zip(items, features) for _ in range(len(rows))]
+    X = np.concatenate(features) if features else np.zeros((0, FEATURE_LENGTH), dtype=np.float32)
+    return X, labels, hits, len(items) - hits
+
+
+def newest_label_map():
+    """Label map (id -> name) of the newest model version, so ids stay stable across versions."""
+    artifacts = discover_models()
+    if not artifacts:
+        return {}
+    newest = artifacts[-1]
+    if newest.labels_path:
+        with open(newest.labels_path, "r") as f:
+            return json.load(f)
+    return read_header(newest.model_path)["labels"]
+
+
+def build_label_map(names, existing=None):
+    """Maps label names to class ids, keeping the ids of letters already in `existing` (id -> name)."""
+    label_map = {str(key): value for key, value in (existing or {}).items()}
+    ids = {value: int(key) for key, value in label_map.items()}
+    next_id = max(ids.values(), default=-1) + 1
+    for name in sorted(set(names)):
+        if name not in ids:
+            ids[name] = next_id
+            label_map[str(next_id)] = name
+            next_id += 1
+    return label_map, ids
+
+
+def train(X, y, test_size=0.2, seed=None, n_estimators=100):
+    """
+    Fits the same RandomForestClassifier the bundled model uses; returns (estimator, held-out accuracy).
+    Letters with a single sample (e.g. one photo of a newly added letter) always go to training.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    accuracy = None
+    classes, counts = np.unique(y, return_counts=True)
+    single = np.isin(y, classes[counts < 2])
+    if test_size > 0 and single.all():
+        test_size = 0  # Nothing left to hold out
+    if test_size > 0:
+        if single.any():
+            print(f"⚠️ {int(single.sum())} letter(s) have a single sample; they are trained on but not evaluated.")
+        try:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X[~single], y[~single], test_size=test_size, shuffle=True, stratify=y[~single], random_state=seed
+            )
+        except ValueError as e:
+            # Too few samples for every letter to appear in the held-out set
+            print(f"⚠️ Stratified split not possible ({e}); splitting without stratification.")
+            X_train, X_test, y_train, y_test = train_test_split(
+                X[~single], y[~single], test_size=test_size, shuffle=True, random_state=seed
+            )
+        X_train = np.concatenate([X_train, X[single]])
+        y_train = np.concatenate([y_train, y[single]])
+    else:
+        X_train, y_train = X, y
+    estimator = RandomForestClassifier(n_estimators=n_estimators, n_jobs=-1, random_state=seed)
+    estimator.fit(X_train, y_train)
+    if test_size > 0:
+        accuracy = float((estimator.predict(X_test) == y_test).mean())
+    estimator.n_jobs = None  # Prediction in the app runs single-threaded
+    return estimator, accuracy
+
+
+def _write_atomic(path, data):
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def write_model(estimator, label_map, output_dir, version):
+    """Writes model.p and label_dict.json (the original format) plus the native model.npz."""
+    os.makedirs(output_dir, exist_ok=True)
+    model_bytes = pickle.dumps({"model": estimator})
+    labels_bytes = json.dumps(label_map).encode()
+    # The artifact records what the pickle and label map will hold, so the registry keeps
+    # using it once they are written next to it
+    source = {"model.p": hashlib.sha1(model_bytes).hexdigest(), "label_dict.json": hashlib.sha1(labels_bytes).hexdigest()}
+    # Every file appears atomically, so a watching app never loads a half-written version;
+    # model.npz carries its own labels and comes first
+    temporary = os.path.join(output_dir, "model.npz.tmp")
+    save_artifact(temporary, export_model(estimator), label_map, version, source)
+    os.replace(temporary, os.path.join(output_dir, "model.npz"))
+    _write_atomic(os.path.join(output_dir, "model.p"), model_bytes)
+    _write_atomic(os.path.join(output_dir, "label_dict.json"), labels_bytes)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Train a BISINDO letter classifier from recordings and images.")
+    parser.add_argument("data", help="Dataset directory with one subdirectory per letter")
+    parser.add_argument("--version", help="Model version to write (default: a timestamp)")
+    parser.add_argument("--output-dir", help=f"Where to write the model (default: {MODELS_DIR}/<version>)")
+    parser.add_argument("--labels", help="Existing label map whose ids are kept (default: the newest model's)")
+    parser.add_argument("--workers", type=int, help="Processes for image feature extraction (default: CPU count)")
+    parser.add_argument("--flip", action="store_true", help="Mirror images first, like the live camera view")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Fraction held out to report accuracy")
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--seed", type=int)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    items = discover_dataset(args.data)
+    if not items:
+        print(f"❌ No recordings or images found under {args.data}")
+        return 1
+
+    X, names, hits, processed = extract_dataset(items, os.path.join(args.data, CACHE_DIRNAME), args.workers, args.flip)
+    extracted = time.perf_counter()
+    print(f"🧮 {len(X)} samples from {len(items)} files ({hits} cached, {processed} processed) "
+          f"in {extracted - started:.1f} s")
+    if len(set(names)) < 2:
+        print("❌ At least two letters with hand detections are needed to train.")
+        return 1
+
+    if args.labels:
+        with open(args.labels, "r") as f:
+            existing = json.load(f)
+    else:
+        existing = newest_label_map()
+    label_map, ids = build_label_map(names, existing)
+    y = np.array([ids[name] for name in names], dtype=np.int64)
+    estimator, accuracy = train(X, y, args.test_size, args.seed, args.trees)
+    trained = time.perf_counter()
+    if accuracy is not None:
+        print(f"🎯 {accuracy * 100:.2f}% of held-out samples classified correctly")
+
+    version = args.version or time.strftime("v%Y%m%d-%H%M%S")
+    output_dir = args.output_dir or os.path.join(MODELS_DIR, version)
+    write_model(estimator, label_map, output_dir, version)
+    print(f"✅ Model {version} ({', '.join(sorted(set(names)))}) written to {output_dir} "
+          f"in {trained - extracted:.1f} s of training")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
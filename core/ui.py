@@ -0,0 +1,74 @@
+import threading
+import time
+
+UI_FPS = 30  # Most UI flushes per second
+IDLE_TIMEOUT = 2.0  # Seconds without changes before the flusher thread exits; the next change restarts it
+
+
+class UiDispatcher:
+    """
+    Funnels UI changes from worker threads into one flusher thread.
+
+    `set(control, attr=value, ...)` records attribute changes; the newest value of an
+    attribute wins. Once per display tick the flusher applies everything pending and
+    sends a single `page.update(*changed_controls)`, so only the changed controls are
+    diffed instead of the whole page, and a burst of changes (a preview frame, the
+    HUD and a status message) goes out as one message. Callers never block on Flet.
+    """
+
+    def __init__(self, page, fps=UI_FPS):
+        self.page = page
+        self.interval = 1.0 / fps
+        self.pending = {}  # id(control) -> (control, {attribute: value}), in the order first changed
+        self.cond = threading.Condition()
+        self.thread = None
+        self.last_flush = 0.0
+        self.requests = 0
+        self.flushes = 0
+
+    def set(self, control, **attributes):
+        """Schedules `attributes` to be set on `control` and the control to be updated."""
+        with self.cond:
+            entry = self.pending.get(id(control))
+            if entry is None:
+                self.pending[id(control)] = (control, dict(attributes))
+            else:
+                entry[1].update(attributes)
+            self.requests += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="ui-dispatcher", daemon=True)
+                self.thread.start()
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                if not self.pending:
+                    self.cond.wait(IDLE_TIMEOUT)
+                    if not self.pending:
+                        self.thread = None
+                        return
+            # Changes arriving during the wait are coalesced into this flush
+            delay = self.last_flush + self.interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with self.cond:
+                pending = list(self.pending.values())
+                self.pending.clear()
+            self.last_flush = time.perf_counter()
+            self._flush(pending)
+
+    def _flush(self, pending):
+        for control, attributes in pending:
+            for name, value in attributes.items():
+                setattr(control, name, value)
+        try:
+            self.page.update(*[control for control, _ in pending])
+        except Exception as e:
+            # A control that is no longer (or not yet) on the page can't be updated on its own
+            print(f"⚠️ Targeted UI update failed ({e}), updating the whole page.")
+            try:
+                self.page.update()
+            except Exception as e:
+                print(f"❌ UI update failed: {e}")
+        self.flushes += 1
@@ -1,4 +1,7 @@
+from core import startup  # First import, so the start-up profiler sees every module after it
 import flet as ft
+import os
+import threading
 from assets.colors.custom_colors import CustomColor
 from components.main_content import CustomMainContent
 from components.sidebar import CustomSidebar
@@ -11,17 +14,17 @@ def main(page: ft.Page):
     page.bgcolor = CustomColor.BACKGROUND
     page.padding = 0
 
-    # Dynamically import TensorFlow-heavy dependencies when "Mulai" is accessed
+    # Dynamically import CV/ML-heavy dependencies when "Mulai" is accessed
     def get_page_content(route):
         if route == "/petunjuk":
             return "Petunjuk", PetunjukPage()
         elif route == "/instalasi":
             return "Instalasi", InstalasiPage(page=page)
         elif route == "/mulai":
-            from pages.mulai import MulaiPage  # Lazy import to delay TensorFlow loading
+            from pages.mulai import MulaiPage  # Lazy import: OpenCV, NumPy and MediaPipe load only when needed
             return "Mulai", MulaiPage(page=page)
         elif route == "/pengaturan":
-            return "Pengaturan", PengaturanPage()
+            return "Pengaturan", PengaturanPage(page=page)
         else:
             return "Page Not Found", ft.Text("Page not found", size=20, color=CustomColor.TEXT)
 
@@ -58,5 +61,19 @@ def main(page: ft.Page):
     page.add(ft.Row([sidebar, main_content], expand=True))
     page.on_route_change = route_change
     page.go("/petunjuk")
+    startup.mark("first paint")
+    startup.report()
+
+    # Warm the model and MediaPipe in the background once the dashboard is visible (BISINDO_WARMUP=0 disables)
+    if os.environ.get("BISINDO_WARMUP", "1") != "0":
+        def warm_up_task():
+            from core.detection import warm_up
+            warm_up()
+            # Pick up new model versions dropped into models/ without restarting (BISINDO_MODEL_WATCH=0 disables)
+            if os.environ.get("BISINDO_MODEL_WATCH", "1") != "0":
+                from core.registry import watch_models
+                watch_models()
+
+        threading.Thread(target=warm_up_task, daemon=True).start()
 
 ft.app(target=main)
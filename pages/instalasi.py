@@ -2,9 +2,11 @@ import flet as ft
 import subprocess
 import sys
 import os
-import time
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, Lock
 from assets.colors.custom_colors import CustomColor
+from core.dependencies import verify_requirements
+from core.ui import UiDispatcher
 
 
 def InstalasiPage(page: ft.Page):
@@ -39,16 +41,7 @@ def InstalasiPage(page: ft.Page):
     ]
 
     is_running = [False]
-
-    def check_library_installed(library_name):
-        """Check if a library is installed in the current Python environment."""
-        try:
-            command = [sys.executable, "-m", "pip", "show", library_name]
-            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            return result.returncode == 0
-        except Exception as e:
-            print(f"❌ Error checking library {library_name}: {e}")
-            return False
+    ui = UiDispatcher(page)  # Control changes from the checker threads
 
     def check_obs_installed():
         """Check if OBS Studio is installed on Windows or macOS."""
@@ -85,53 +78,49 @@ def InstalasiPage(page: ft.Page):
 
     def check_dependencies():
         """Check if all dependencies in requirements.txt are installed."""
-        status_text.value = "🔍 Memeriksa dependensi..."
-        page.update()
+        ui.set(status_text, value="🔍 Memeriksa dependensi...")
 
-        for idx, dependency in enumerate(dependencies):
-            if check_library_installed(dependency):
-                dependency_status[idx]["checkbox"].value = True
-                dependency_status[idx]["label"].color = CustomColor.TEXT
-            else:
-                dependency_status[idx]["checkbox"].value = False
-                dependency_status[idx]["label"].color = "#FF6B6B"  # Red for missing dependencies
+        done = [0]
+        lock = Lock()
+
+        def on_result(idx, status):
+            # Called from the checker's worker threads as each requirement finishes
+            ui.set(dependency_status[idx]["checkbox"], value=status.satisfied)
+            ui.set(dependency_status[idx]["label"], color=CustomColor.TEXT if status.satisfied else "#FF6B6B")  # Red for missing dependencies
+            if status.installed_version and not status.satisfied:
+                print(f"⚠️ {status.name} {status.installed_version} tidak memenuhi {status.requirement}")
+            with lock:
+                done[0] += 1
+                ui.set(progress_bar, value=done[0] / len(dependencies))
 
-            progress_bar.value = (idx + 1) / len(dependencies)
-            page.update()
+        verify_requirements(dependencies, on_result)
 
-        status_text.value = "✅ Pemeriksaan dependensi selesai."
-        page.update()
+        ui.set(status_text, value="✅ Pemeriksaan dependensi selesai.")
 
     def run_installation(e):
         """Execute the dependency and OBS check process."""
         if is_running[0]:
             is_running[0] = False
-            start_button.text = "🔍 Periksa Dependensi"
-            start_button.bgcolor = CustomColor.PRIMARY
-            start_button.update()
+            ui.set(start_button, text="🔍 Periksa Dependensi", bgcolor=CustomColor.PRIMARY)
             return
 
         is_running[0] = True
-        start_button.text = "🛑 Berhenti"
-        start_button.bgcolor = "#FF6B6B"
-        start_button.update()
+        ui.set(start_button, text="🛑 Berhenti", bgcolor="#FF6B6B")
 
         def check_thread():
-            check_dependencies()
-            obs_installed = check_obs_installed()
+            # The OBS probe may shell out, so it runs alongside the library checks
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                obs_future = executor.submit(check_obs_installed)
+                check_dependencies()
+                obs_installed = obs_future.result()
 
             if obs_installed:
-                obs_status_label.value = "📡 OBS Studio Terdeteksi! 🚀 Siap digunakan!"
-                obs_status_label.color = CustomColor.TEXT
+                ui.set(obs_status_label, value="📡 OBS Studio Terdeteksi! 🚀 Siap digunakan!", color=CustomColor.TEXT)
             else:
-                obs_status_label.value = "🚨 OBS Studio Tidak Ditemukan! 😢"
-                obs_status_label.color = "#FF6B6B"  # Red text
+                ui.set(obs_status_label, value="🚨 OBS Studio Tidak Ditemukan! 😢", color="#FF6B6B")  # Red text
 
             is_running[0] = False
-            start_button.text = "🔍 Periksa Dependensi"
-            start_button.bgcolor = CustomColor.PRIMARY
-            start_button.update()
-            page.update()
+            ui.set(start_button, text="🔍 Periksa Dependensi", bgcolor=CustomColor.PRIMARY)
 
         Thread(target=check_thread).start()
 
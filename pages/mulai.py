@@ -1,6 +1,5 @@
 import flet as ft
 import threading
-import sklearn
 from assets.colors.custom_colors import CustomColor
 from core.detection import (
     load_heavy_dependencies,
@@ -9,23 +8,34 @@ from core.detection import (
     start_inference,
     stop_inference,
     model_loaded,
-    ENABLE_VIRTUAL_CAM
+    mediapipe_loaded
 )
+from core.session import DetectionSession
+from core.metrics import Metrics
+from core.ui import UiDispatcher
 
 def MulaiPage(page: ft.Page):
-    stop_flag = [False]
-    model_ready = [False]  
-    virtual_cam = [None]  
+    session = DetectionSession()  # Subtitle state owned by this page, the model itself is shared
+    engine = [None]  # DetectionEngine of the current run
+    ui = UiDispatcher(page)  # Every control change from worker threads goes through here
+    metrics = Metrics()  # Stage timings for the HUD, disabled unless BISINDO_METRICS=1 or the switch is on
 
     def start_background_loading():
-        """Load TensorFlow and model in the background after UI is displayed."""
+        """Load MediaPipe and the model in the background after UI is displayed."""
+        ready_content = ft.Text("📷", size=100)
+        ready_message = "Klik tombol mulai untuk mulai mendeteksi."
+
+        if model_loaded[0] and mediapipe_loaded():
+            # Already warm from a previous visit or the start-up warm-up; the page isn't shown yet
+            camera_placeholder.content = ready_content
+            status_text.value = ready_message
+            return
+
         def background_task():
             load_heavy_dependencies()  
             load_model()  
-            model_ready[0] = True  
-            camera_placeholder.content = ft.Text("📷", size=100)  
-            status_text.value = "Klik tombol mulai untuk mulai mendeteksi."  
-            page.update()
+            ui.set(camera_placeholder, content=ready_content)
+            ui.set(status_text, value=ready_message)
 
         threading.Thread(target=background_task, daemon=True).start()
 
@@ -51,7 +61,7 @@ def MulaiPage(page: ft.Page):
         color=CustomColor.CARD,
         height=60,
         width=200,
-        on_click=lambda e: start_inference(stop_flag, model_ready, virtual_cam, camera_placeholder, camera_frame, status_text, page)
+        on_click=lambda e: start_inference(session, engine, camera_placeholder, camera_frame, status_text, ui, metrics, hud_text)
     )
 
     stop_button = ft.ElevatedButton(
@@ -60,7 +70,7 @@ def MulaiPage(page: ft.Page):
         color=CustomColor.CARD,
         height=60,
         width=200,
-        on_click=lambda e: stop_inference(stop_flag, virtual_cam, camera_placeholder, status_text, page)
+        on_click=lambda e: stop_inference(engine, camera_placeholder, status_text, ui)
     )
 
     status_text = ft.Text(
@@ -70,6 +80,20 @@ def MulaiPage(page: ft.Page):
         text_align=ft.TextAlign.CENTER
     )
 
+    hud_text = ft.Text(
+        "",
+        size=12,
+        color=CustomColor.TEXT,
+        font_family="monospace",
+        visible=metrics.enabled
+    )
+
+    def toggle_hud(e):
+        metrics.enabled = e.control.value
+        ui.set(hud_text, visible=metrics.enabled)
+
+    hud_switch = ft.Switch(label="📊 Statistik performa", value=metrics.enabled, on_change=toggle_hud)
+
     start_background_loading()
 
     return ft.Container(
@@ -82,6 +106,6 @@ def MulaiPage(page: ft.Page):
         content=ft.Row([
             ft.Column(expand=True, alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=40, controls=[camera_placeholder, status_text]),
             ft.Container(width=16),
-            ft.Column(alignment=ft.MainAxisAlignment.CENTER, spacing=20, controls=[start_button, stop_button])
+            ft.Column(alignment=ft.MainAxisAlignment.CENTER, spacing=20, controls=[start_button, stop_button, hud_switch, hud_text])
         ])
     )
@@ -1,12 +1,291 @@
 import flet as ft
 from assets.colors.custom_colors import CustomColor
+from core import settings
+from core.ui import UiDispatcher
+
+
+RESOLUTIONS = {"Bawaan": (0, 0), "640x480": (640, 480), "1280x720": (1280, 720), "1920x1080": (1920, 1080)}
+CAPTURE_FPS = (0, 15, 24, 30, 60)  # 0 = driver default
+
+
+def PengaturanPage(page: ft.Page):
+    governor = settings.governor
+    capture = settings.capture
+    detection = settings.detection
+    sentence = settings.sentence
+    ui = UiDispatcher(page)  # The model reload reports back from a worker thread
+
+    sliders = {}  # Governor key -> (slider, value text), for keeping linked limits consistent
+
+    def keep_preview_order(key):
+        # The governor assumes min_preview_fps <= max_preview_fps; move the other limit along
+        low, high = "min_preview_fps", "max_preview_fps"
+        if governor[low] <= governor[high]:
+            return
+        other = high if key == low else low
+        governor[other] = governor[key]
+        slider, value_text = sliders[other]
+        slider.value = governor[other]
+        value_text.value = str(governor[other])
+        slider.update()
+        value_text.update()
+
+    def slider_row(label, key, minimum, maximum, note="", config=governor, step=1):
+        value_text = ft.Text(str(config[key]), size=16, color=CustomColor.TEXT, weight=ft.FontWeight.BOLD, width=40)
+
+        def on_change(e):
+            config[key] = int(e.control.value) if step == 1 else round(e.control.value, 2)
+            value_text.value = str(config[key])
+            value_text.update()
+            if config is governor and key in ("min_preview_fps", "max_preview_fps"):
+                keep_preview_order(key)
+
+        slider = ft.Slider(
+            min=minimum,
+            max=maximum,
+            divisions=round((maximum - minimum) / step),
+            value=config[key],
+            active_color=CustomColor.PRIMARY,
+            width=420,
+            on_change=on_change
+        )
+        if config is governor:
+            sliders[key] = (slider, value_text)
+
+        return ft.Column(
+            spacing=4,
+            controls=[
+                ft.Text(label + (f"  ({note})" if note else ""), size=16, color=CustomColor.TEXT),
+                ft.Row(
+                    spacing=10,
+                    controls=[slider, value_text]
+                )
+            ]
+        )
+
+    def on_toggle(e):
+        governor["enabled"] = e.control.value
+
+    def on_roi_toggle(e):
+        detection["roi"] = e.control.value
+
+    def on_decoder_change(e):
+        sentence["decoder"] = e.control.value
+
+    # Capture settings take effect the next time detection starts
+    def on_source_change(e):
+        value = e.control.value.strip() or "0"
+        capture["source"] = int(value) if value.isdigit() else value
+
+    def on_resolution_change(e):
+        capture["width"], capture["height"] = RESOLUTIONS[e.control.value]
+
+    def on_capture_fps_change(e):
+        capture["fps"] = int(e.control.value)
+
+    def capture_switch(label, key):
+        def on_change(e):
+            capture[key] = e.control.value
+
+        return ft.Switch(label=label, value=capture[key], active_color=CustomColor.PRIMARY, on_change=on_change)
+
+    resolution = next((name for name, size in RESOLUTIONS.items() if size == (capture["width"], capture["height"])), "Bawaan")
+
+    status_text = ft.Text(size=16, color=CustomColor.TEXT)
+
+    def refresh_status(e=None):
+        runs = list(settings.status.values())  # One entry per running engine
+        lines = []
+        for number, status in enumerate(runs, 1):
+            if len(runs) > 1:
+                lines.append(f"▶️ Deteksi {number}")
+            if "capture" in status:
+                lines.append(f"📷 Kamera: {status['capture']}   ⏱️ Latensi tangkap→proses: {status['capture_latency_ms']:.0f} ms")
+            if "process_fps" in status:
+                lines.append(
+                    f"⚙️ Proses: {status['process_fps']:.1f} fps   "
+                    f"🖐️ Deteksi: {status['detection_fps']:.1f} fps (setiap {status['detection_stride']} frame)"
+                )
+                lines.append(f"🖼️ Pratinjau: maks {status['preview_fps_cap']} fps   📈 Beban: {status['load'] * 100:.0f}%")
+        status_text.value = "\n".join(lines) if runs else "⏸️ Deteksi tidak berjalan."
+        if e is not None:
+            ui.set(status_text)
+
+    refresh_status()
+
+    # Model versions live in core.registry, imported here so the dashboard start-up stays light
+    from core import registry
+    versions = [artifact.version for artifact in registry.discover_models()]
+    model_text = ft.Text(size=16, color=CustomColor.TEXT)
+    version_dropdown = ft.Dropdown(
+        width=260,
+        value=registry.current_version() or (versions[-1] if versions else None),
+        options=[ft.dropdown.Option(version) for version in versions]
+    )
+
+    def model_status(message=None):
+        current = registry.current_version()
+        return message or (f"🧠 Model aktif: {current}" if current else "🧠 Model belum dimuat.")
+
+    def on_model_swapped(loaded, error):
+        ui.set(model_text, value=model_status(f"❌ Gagal memuat model: {error}" if error else None))
+
+    def switch_model(e):
+        ui.set(model_text, value=f"⏳ Memuat model {version_dropdown.value}...")
+        registry.swap_model_in_background(version_dropdown.value, on_model_swapped)
+
+    model_text.value = model_status()
 
-def PengaturanPage():
     return ft.Container(
         expand=True,
         width=float("inf"),
         bgcolor=CustomColor.BACKGROUND,
         border_radius=15,
         padding=20,
-        content=ft.Text("Pengaturan Content", size=18, color=CustomColor.TEXT)
+        content=ft.Column(
+            spacing=24,
+            scroll=ft.ScrollMode.AUTO,
+            controls=[
+                ft.Text("🚦 Pengatur Frame Rate Adaptif", size=20, color=CustomColor.TEXT, weight=ft.FontWeight.BOLD),
+                ft.Switch(
+                    label="Kurangi beban otomatis saat CPU sibuk",
+                    value=governor["enabled"],
+                    active_color=CustomColor.PRIMARY,
+                    on_change=on_toggle
+                ),
+                slider_row("🎯 Target FPS kamera virtual", "target_fps", 10, 60, "berlaku saat deteksi dimulai"),
+                slider_row("🖐️ Lewati deteksi maksimal setiap N frame", "max_detection_stride", 1, 6),
+                slider_row("🖼️ FPS pratinjau minimum", "min_preview_fps", 1, 15),
+                slider_row("🖼️ FPS pratinjau maksimum", "max_preview_fps", 5, 30),
+                ft.Container(
+                    bgcolor=CustomColor.CARD,
+                    border_radius=20,
+                    padding=20,
+                    content=ft.Column(
+                        spacing=12,
+                        controls=[
+                            ft.Text("🖐️ Deteksi Tangan", size=18, color=CustomColor.TEXT, weight=ft.FontWeight.BOLD),
+                            ft.Text("Berlaku saat deteksi dimulai.", size=14, color=CustomColor.TEXT),
+                            ft.Switch(
+                                label="Potong gambar di sekitar tangan terakhir (lebih cepat)",
+                                value=detection["roi"],
+                                active_color=CustomColor.PRIMARY,
+                                on_change=on_roi_toggle
+                            ),
+                            slider_row("🔍 Skala gambar untuk MediaPipe", "scale", 0.25, 1.0, "1.0 = ukuran asli",
+                                       config=detection, step=0.05)
+                        ]
+                    )
+                ),
+                ft.Container(
+                    bgcolor=CustomColor.CARD,
+                    border_radius=20,
+                    padding=20,
+                    content=ft.Column(
+                        spacing=12,
+                        controls=[
+                            ft.Text("✍️ Penyusun Kalimat", size=18, color=CustomColor.TEXT, weight=ft.FontWeight.BOLD),
+                            ft.Text("Berlaku saat halaman Mulai dibuka.", size=14, color=CustomColor.TEXT),
+                            ft.Dropdown(
+                                label="Dekoder",
+                                width=420,
+                                value=sentence["decoder"],
+                                options=[
+                                    ft.dropdown.Option("vote", "Voting (jendela tetap)"),
+                                    ft.dropdown.Option("confidence", "Keyakinan (langsung)")
+                                ],
+                                on_change=on_decoder_change
+                            ),
+                            # Non-overlapping ranges keep the release threshold below the commit threshold
+                            slider_row("✅ Ambang keyakinan huruf", "commit_threshold", 0.5, 0.95, "dekoder keyakinan",
+                                       config=sentence, step=0.05),
+                            slider_row("↩️ Ambang lepas huruf", "release_threshold", 0.05, 0.45, "dekoder keyakinan",
+                                       config=sentence, step=0.05)
+                        ]
+                    )
+                ),
+                ft.Container(
+                    bgcolor=CustomColor.CARD,
+                    border_radius=20,
+                    padding=20,
+                    content=ft.Column(
+                        spacing=12,
+                        controls=[
+                            ft.Text("📷 Kamera", size=18, color=CustomColor.TEXT, weight=ft.FontWeight.BOLD),
+                            ft.Text("Berlaku saat deteksi dimulai.", size=14, color=CustomColor.TEXT),
+                            ft.TextField(
+                                label="Sumber (indeks kamera, file video, atau synthetic)",
+                                value=str(capture["source"]),
+                                width=420,
+                                on_change=on_source_change
+                            ),
+                            ft.Row(
+                                spacing=10,
+                                controls=[
+                                    ft.Dropdown(
+                                        label="Resolusi",
+                                        width=200,
+                                        value=resolution,
+                                        options=[ft.dropdown.Option(name) for name in RESOLUTIONS],
+                                        on_change=on_resolution_change
+                                    ),
+                                    ft.Dropdown(
+                                        label="FPS kamera",
+                                        width=200,
+                                        value=str(capture["fps"]),
+                                        options=[ft.dropdown.Option(str(fps), "Bawaan" if fps == 0 else str(fps)) for fps in CAPTURE_FPS],
+                                        on_change=on_capture_fps_change
+                                    )
+                                ]
+                            ),
+                            capture_switch("Gunakan MJPG (resolusi tinggi pada kamera USB)", "mjpg"),
+                            capture_switch("Ambil frame di thread terpisah (selalu frame terbaru)", "threaded"),
+                            slider_row("🗂️ Buffer driver kamera", "buffer_size", 0, 4, "0 = bawaan, 1 = latensi terendah", capture)
+                        ]
+                    )
+                ),
+                ft.Container(
+                    bgcolor=CustomColor.CARD,
+                    border_radius=20,
+                    padding=20,
+                    content=ft.Column(
+                        spacing=12,
+                        controls=[
+                            ft.Text("🧠 Versi Model", size=18, color=CustomColor.TEXT, weight=ft.FontWeight.BOLD),
+                            model_text,
+                            ft.Row(
+                                spacing=10,
+                                controls=[
+                                    version_dropdown,
+                                    ft.ElevatedButton(
+                                        text="🔁 Gunakan",
+                                        bgcolor=CustomColor.PRIMARY,
+                                        color=CustomColor.CARD,
+                                        on_click=switch_model
+                                    )
+                                ]
+                            )
+                        ]
+                    )
+                ),
+                ft.Container(
+                    bgcolor=CustomColor.CARD,
+                    border_radius=20,
+                    padding=20,
+                    content=ft.Column(
+                        spacing=12,
+                        controls=[
+                            ft.Text("📊 Laju efektif saat ini", size=18, color=CustomColor.TEXT, weight=ft.FontWeight.BOLD),
+                            status_text,
+                            ft.ElevatedButton(
+                                text="🔄 Perbarui",
+                                bgcolor=CustomColor.PRIMARY,
+                                color=CustomColor.CARD,
+                                on_click=refresh_status
+                            )
+                        ]
+                    )
+                )
+            ]
+        )
     )
@@ -0,0 +1,37 @@
+"""FastClassifier must reproduce the pickled scikit-learn model exactly."""
+import pickle
+
+import numpy as np
+import pytest
+
+from benchmarks import fixtures
+from core.classifier import compile_model
+from core.registry import MODEL_PATH
+
+sklearn = pytest.importorskip("sklearn")
+
+
+@pytest.fixture(scope="module")
+def estimator():
+    with open(MODEL_PATH, "rb") as f:
+        return pickle.load(f)["model"]
+
+
+@pytest.fixture(scope="module")
+def features():
+    # Hand-shaped landmark sequences, one and two hands, plus uniform noise to reach every branch
+    one = fixtures.features_for(fixtures.synthetic_landmarks(2000, hands=1))
+    two = fixtures.features_for(fixtures.synthetic_landmarks(2000, hands=2))
+    noise = np.random.default_rng(fixtures.SEED).random((4000, one.shape[1]), dtype=np.float32)
+    return np.concatenate([one, two, noise])
+
+
+def test_predict_matches_sklearn(estimator, features):
+    compiled = compile_model(estimator)
+    np.testing.assert_array_equal(compiled.predict(features), estimator.predict(features))
+    assert compiled.predict(features[0]) == estimator.predict(features[:1])[0]
+
+
+def test_predict_proba_matches_sklearn(estimator, features):
+    compiled = compile_model(estimator)
+    np.testing.assert_array_equal(compiled.predict_proba(features), estimator.predict_proba(features))
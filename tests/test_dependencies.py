@@ -0,0 +1,25 @@
+"""The fallback version check must agree with `packaging` where both apply."""
+import pytest
+
+from core.dependencies import _fallback_satisfies
+
+CASES = [
+    ("1.9", "~=1.4.0"),
+    ("1.4.5", "~=1.4.0"),
+    ("1.4", "~=1.4.0"),
+    ("1.9", "~=1.4"),
+    ("2.0", "~=1.4"),
+    ("1.5", "==1.0.*"),
+    ("1.0", "==1.0.*"),
+    ("1.0.3", "==1.0.*"),
+    ("2.1", "!=2.*"),
+    ("1.2.0", "==1.2"),
+    ("0.9", ">=1.0"),
+    ("4.10.0", ">=4.9,<5"),
+]
+
+
+@pytest.mark.parametrize("version, specifier", CASES)
+def test_fallback_matches_packaging(version, specifier):
+    specifiers = pytest.importorskip("packaging.specifiers")
+    assert _fallback_satisfies(version, specifier) == (version in specifiers.SpecifierSet(specifier))
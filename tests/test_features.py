@@ -0,0 +1,61 @@
+"""Parity of the vectorised feature extraction with the original per-point loop."""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.features import FEATURE_LENGTH, NUM_LANDMARKS, extract_features_batch, hand_features
+
+
+def fix_feature_vector_length(data_aux, expected_length):
+    if len(data_aux) < expected_length:
+        data_aux += [0] * (expected_length - len(data_aux))
+    elif len(data_aux) > expected_length:
+        data_aux = data_aux[:expected_length]
+    return data_aux
+
+
+def legacy_features(multi_hand_landmarks):
+    """The loop the live detection used before core.features."""
+    data_aux, x_, y_ = [], [], []
+    for hand_landmarks in multi_hand_landmarks:
+        for i in range(len(hand_landmarks.landmark)):
+            x_.append(hand_landmarks.landmark[i].x)
+            y_.append(hand_landmarks.landmark[i].y)
+        for i in range(len(hand_landmarks.landmark)):
+            data_aux.append(hand_landmarks.landmark[i].x - min(x_))
+            data_aux.append(hand_landmarks.landmark[i].y - min(y_))
+    return np.asarray(fix_feature_vector_length(data_aux, FEATURE_LENGTH), dtype=np.float32)
+
+
+def fake_hands(coords):
+    return [
+        SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in hand])
+        for hand in coords
+    ]
+
+
+def random_coords(rng, hands):
+    # float32 like MediaPipe's landmarks, so both paths subtract the same values
+    return rng.random((hands, NUM_LANDMARKS, 2), dtype=np.float32)
+
+
+@pytest.mark.parametrize("hands", [1, 2, 3])  # A third hand is truncated away
+def test_hand_features_match_legacy_loop(hands):
+    rng = np.random.default_rng(hands)
+    out = np.empty(FEATURE_LENGTH, dtype=np.float32)
+    for _ in range(1000):
+        multi_hand_landmarks = fake_hands(random_coords(rng, hands))
+        expected = legacy_features(multi_hand_landmarks)
+        np.testing.assert_array_equal(hand_features(multi_hand_landmarks, out), expected)
+
+
+def test_batch_features_match_legacy_loop():
+    rng = np.random.default_rng(0)
+    counts = rng.integers(0, 4, size=500)
+    coords = rng.random((len(counts), 3, NUM_LANDMARKS, 2), dtype=np.float32)
+    batch = extract_features_batch(coords, counts)
+    assert batch.shape == (len(counts), FEATURE_LENGTH)
+    for frame, count in enumerate(counts):
+        expected = legacy_features(fake_hands(coords[frame, :count]))
+        np.testing.assert_array_equal(batch[frame], expected)
@@ -0,0 +1,70 @@
+"""Chunked offline processing seeks into the recording and still matches a single pass."""
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from core import offline
+from core.features import NUM_LANDMARKS
+
+FRAMES = 300
+SIZE = (160, 120)
+
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    """An mp4v clip (keyframe every few frames) whose frames all differ from each other."""
+    path = str(tmp_path_factory.mktemp("offline") / "clip.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 30, SIZE)
+    if not writer.isOpened():
+        pytest.skip("no mp4v encoder in this OpenCV build")
+    for index in range(FRAMES):
+        frame = np.full((SIZE[1], SIZE[0], 3), (index * 7) % 256, dtype=np.uint8)
+        cv2.putText(frame, str(index), (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+class FrameHands:
+    """Stands in for MediaPipe: "finds" a hand whose landmarks are read off the frame's pixels."""
+
+    def process(self, image):
+        if image.mean() > 160:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        columns = image[:, :: image.shape[1] // NUM_LANDMARKS].mean(axis=(0, 2))[:NUM_LANDMARKS] / 255
+        rows = image[:: image.shape[0] // NUM_LANDMARKS].mean(axis=(1, 2))[:NUM_LANDMARKS] / 255
+        landmark = [SimpleNamespace(x=float(x), y=float(y)) for x, y in zip(columns, rows)]
+        return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=landmark)])
+
+    def close(self):
+        pass
+
+
+def test_seeked_frames_match_sequential_decode(clip):
+    sequential = list(offline.iter_frames(clip))
+    assert [index for index, _, _ in sequential] == list(range(FRAMES))
+    for start in (1, 37, 97, 250, FRAMES - 1):
+        seeked = list(offline.iter_frames(clip, start=start, stop=start + 20))
+        expected = sequential[start:start + 20]
+        assert [index for index, _, _ in seeked] == [index for index, _, _ in expected]
+        for (_, _, frame), (_, _, reference) in zip(seeked, expected):
+            np.testing.assert_array_equal(frame, reference)
+
+
+def test_chunked_records_match_single_pass(clip, monkeypatch):
+    monkeypatch.setattr(offline, "create_hands", lambda: FrameHands())
+    _, single = offline.process_chunk(clip)
+    chunks = offline.plan_chunks(clip, 90)  # Chunk starts fall between keyframes
+    assert len(chunks) > 1
+    merged = []
+    for begin, end in chunks:
+        _, records = offline.process_chunk(clip, begin, end, overlap=10)
+        merged.extend(records)
+
+    def key(records):
+        return [(index, hand, character) for index, _, hand, character, _ in records]
+
+    assert any(hand for _, _, hand, _, _ in single)
+    assert key(merged) == key(single)
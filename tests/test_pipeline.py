@@ -0,0 +1,32 @@
+"""LatestQueue counts every frame it skips, whether `put` or `poll` replaced it."""
+from core.pipeline import FramePacket, LatestQueue, StageStats, start_paced_stage
+
+
+def packets(count, released):
+    return [FramePacket(index, index, 0.0, released.append) for index in range(count)]
+
+
+def test_put_and_poll_both_count_drops():
+    released = []
+    queue = LatestQueue(maxsize=3)
+    items = packets(5, released)
+    for packet in items:
+        queue.put(packet)  # Two overflow the queue
+    assert queue.dropped == 2
+    assert queue.poll() is items[-1]  # The two older ones are skipped
+    assert queue.dropped == 4
+    assert released == [0, 1, 2, 3]
+    assert queue.poll() is None
+
+
+def test_stage_summary_reports_its_queue_drops():
+    queue = LatestQueue(maxsize=4)
+    stats = StageStats("paced")
+    released = []
+    for packet in packets(4, released):
+        queue.put(packet)
+    thread = start_paced_stage("paced", queue, lambda packet: None, 100, stats)
+    queue.close()
+    thread.join(5)
+    assert stats.summary()["dropped"] == queue.dropped == 3
+    assert released == [0, 1, 2, 3]
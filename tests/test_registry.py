@@ -0,0 +1,43 @@
+"""The bundled model.npz must never shadow an edited model.p / label_dict.json."""
+import json
+import os
+import shutil
+
+import pytest
+
+from core import registry
+from core.artifact import convert_pickle, read_header, source_digests
+
+pytest.importorskip("sklearn")  # Converting the pickle unpickles the sklearn estimator
+
+
+def test_committed_artifact_matches_bundled_pickle():
+    header = read_header(registry.ARTIFACT_PATH)
+    assert header["source"] == source_digests(registry.MODEL_PATH, registry.LABELS_PATH)
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    shutil.copy(registry.MODEL_PATH, tmp_path / "model.p")
+    shutil.copy(registry.LABELS_PATH, tmp_path / "label_dict.json")
+    convert_pickle(str(tmp_path / "model.p"), str(tmp_path / "model.npz"), str(tmp_path / "label_dict.json"), "v1")
+    return tmp_path
+
+
+def test_artifact_used_while_built_from_current_pickle(model_dir):
+    artifact = registry._find_artifact("v1", str(model_dir))
+    assert artifact.model_path.endswith("model.npz")
+
+
+def test_edited_labels_fall_back_to_pickle(model_dir):
+    labels = json.loads((model_dir / "label_dict.json").read_text())
+    labels["0"] = "Z"
+    (model_dir / "label_dict.json").write_text(json.dumps(labels))
+    artifact = registry._find_artifact("v1", str(model_dir))
+    assert artifact.model_path.endswith("model.p")
+    assert registry.load_artifact(artifact).labels["0"] == "Z"
+
+
+def test_artifact_alone_is_used(model_dir):
+    os.remove(model_dir / "model.p")
+    assert registry._find_artifact("v1", str(model_dir)).model_path.endswith("model.npz")
@@ -0,0 +1,127 @@
+"""End-to-end: the WebSocket server streams a headless engine's events to a local client."""
+import asyncio
+import json
+import socket
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from core import engine as engine_module
+from core import settings
+from core.engine import DetectionEngine
+from core.server import serve
+from core.sinks import NullSink
+
+websockets = pytest.importorskip("websockets")
+
+
+class NoHands:
+    """Stands in for the Hands graph so the test doesn't depend on what MediaPipe finds in synthetic frames."""
+
+    def process(self, image):
+        return SimpleNamespace(multi_hand_landmarks=None)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def no_hands(monkeypatch):
+    monkeypatch.setattr(engine_module, "acquire_hands", lambda: NoHands())
+    monkeypatch.setattr(engine_module, "release_hands", lambda hands: None)
+
+
+def stream_events(engine, stop_after=None):
+    """Serves `engine` and collects what a local client receives, from "hello" to "stopped"."""
+    port = free_port()
+
+    async def client():
+        events = []
+        for _ in range(50):  # The server comes up asynchronously
+            try:
+                websocket = await websockets.connect(f"ws://127.0.0.1:{port}/")
+                break
+            except OSError:
+                await asyncio.sleep(0.05)
+        async with websocket:
+            async for message in websocket:
+                event = json.loads(message)
+                events.append(event)
+                if stop_after and sum(e["type"] == "prediction" for e in events) == stop_after:
+                    engine.stop()
+                if event["type"] == "stopped":
+                    break
+        return events
+
+    async def main():
+        server = asyncio.create_task(serve(engine, "127.0.0.1", port))
+        events = await asyncio.wait_for(client(), 20)
+        await asyncio.wait_for(server, 20)
+        return events
+
+    return asyncio.run(main())
+
+
+def check_run(events, null):
+    kinds = [event["type"] for event in events]
+    assert kinds[0] == "hello"
+    assert "preview" not in kinds  # Only sent to clients that ask for it
+    assert not any(event["type"] == "status" and event["state"] == "error" for event in events)
+    predictions = [event for event in events if event["type"] == "prediction"]
+    assert predictions and not any(event["hand"] for event in predictions)
+    assert [event["index"] for event in predictions] == sorted(event["index"] for event in predictions)
+    assert kinds[-1] == "stopped"
+    assert "null" in [stage["stage"] for stage in events[-1]["stats"]]
+    assert null.frames > 0
+    return predictions
+
+
+def test_client_receives_events_from_synthetic_source(no_hands, monkeypatch):
+    monkeypatch.setitem(settings.capture, "width", 320)
+    monkeypatch.setitem(settings.capture, "height", 240)
+    monkeypatch.setitem(settings.capture, "fps", 60)
+    null = NullSink()
+    engine = DetectionEngine(source="synthetic", virtual_cam=False, record_path=None, video_path=None, sinks=[null])
+    predictions = check_run(stream_events(engine, stop_after=10), null)
+    assert len(predictions) >= 10
+
+
+def test_client_receives_events_from_video_file(no_hands, tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (320, 240))
+    for index in range(45):
+        writer.write(np.full((240, 320, 3), index * 5, dtype=np.uint8))
+    writer.release()
+    null = NullSink()
+    engine = DetectionEngine(source=path, virtual_cam=False, record_path=None, video_path=None, sinks=[null])
+    events = stream_events(engine)  # Runs until the file ends
+    check_run(events, null)
+    capture = next(stage for stage in events[-1]["stats"] if stage["stage"] == "capture")
+    assert capture["frames"] == 44  # The first frame only sizes the pipeline
+
+
+def test_stopping_one_engine_keeps_the_others_status(no_hands):
+    engines = [
+        DetectionEngine(source="synthetic", virtual_cam=False, record_path=None, video_path=None, realtime=False)
+        for _ in range(2)
+    ]
+    for engine in engines:
+        engine.start()
+    try:
+        deadline = time.time() + 10
+        while not all("capture" in settings.status.get(engine, {}) for engine in engines) and time.time() < deadline:
+            time.sleep(0.05)
+        engines[0].stop()
+        assert engines[0].wait(10)
+        assert engines[0] not in settings.status
+        assert "capture" in settings.status[engines[1]]
+    finally:
+        engines[1].stop()
+        engines[1].wait(10)
+    assert not settings.status
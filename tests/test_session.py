@@ -0,0 +1,74 @@
+"""Concurrent detection sessions share one model and don't interfere with each other."""
+import threading
+
+import numpy as np
+import pytest
+
+from core import registry
+from core.features import FEATURE_LENGTH
+from core.session import DetectionSession
+
+STREAMS = 6
+FRAMES = 600
+
+
+def confident_features(loaded, seed=0, count=20000):
+    """Random feature vectors the model classifies with high confidence, so both decoders commit letters."""
+    rng = np.random.default_rng(seed)
+    candidates = rng.random((count, FEATURE_LENGTH), dtype=np.float32) * rng.random((count, 1), dtype=np.float32)
+    _, proba = loaded.predict_with_proba(candidates)
+    return candidates[proba.max(axis=1) > 0.6]
+
+
+def synthetic_stream(pool, seed):
+    """
+    Per-frame features and hand presence: held signs (20 frames of one vector) separated by
+    noisy frames, in bursts with pauses longer than the subtitle timeout.
+    """
+    rng = np.random.default_rng(seed)
+    held = pool[rng.integers(len(pool), size=FRAMES // 20)].repeat(20, axis=0)
+    noise = rng.random((FRAMES, FEATURE_LENGTH), dtype=np.float32)
+    features = np.where((np.arange(FRAMES) % 20 < 15)[:, np.newaxis], held, noise)
+    hand = (np.arange(FRAMES) // 150) % 2 == 0
+    return features, hand
+
+
+def run_stream(pool, seed, decoder, models=None):
+    features, hand = synthetic_stream(pool, seed)
+    loaded = registry.get_model()
+    if models is not None:
+        models.append(loaded)
+    session = DetectionSession(decoder=decoder)
+    sentences = []
+    for i in range(FRAMES):
+        characters, proba = loaded.predict_with_proba(features[i][np.newaxis])
+        session.advance_sentence(bool(hand[i]), characters[0] if hand[i] else None, i / 30,
+                                 proba[0] if hand[i] else None, loaded.class_labels)
+        if not sentences or sentences[-1] != session.constructed_sentence:
+            sentences.append(session.constructed_sentence)
+    return sentences
+
+
+@pytest.mark.parametrize("decoder", ["vote", "confidence"])
+def test_concurrent_sessions_match_sequential(monkeypatch, decoder):
+    pool = confident_features(registry.get_model())
+    expected = [run_stream(pool, seed, decoder) for seed in range(STREAMS)]
+    assert any(len(sentence) > 1 for sentences in expected for sentence in sentences)
+
+    monkeypatch.setattr(registry, "_loaded", None)  # Every thread races for the first load
+    barrier = threading.Barrier(STREAMS)
+    models = []
+    results = [None] * STREAMS
+
+    def worker(seed):
+        barrier.wait()
+        results[seed] = run_stream(pool, seed, decoder, models)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(STREAMS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == expected
+    assert len(models) == STREAMS and all(model is models[0] for model in models)
@@ -0,0 +1,38 @@
+"""SubtitleRenderer must draw exactly what the original full-frame blend drew."""
+import cv2
+import numpy as np
+import pytest
+
+from core.subtitle import LINE_SPACING, RECTANGLE_MARGIN_BOTTOM, TEXT_SIZE, TEXT_THICKNESS, SubtitleRenderer, wrap_text
+
+SIZES = [(480, 640), (720, 1280), (1080, 1920), (360, 500)]
+SENTENCES = ["A", "HALO APA KABAR", "A B C D E F G A B C D E F G", "SELAMAT PAGI " * 12]
+
+
+def legacy_draw(frame, sentence):
+    """The original overlay: copy the whole frame, draw the box, blend the whole frame."""
+    H, W = frame.shape[:2]
+    lines, exceeded = wrap_text(sentence, W - 100, TEXT_SIZE, TEXT_THICKNESS)
+    text_width = max([cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, TEXT_SIZE, TEXT_THICKNESS)[0][0] for line in lines]) + 40
+    subtitle_bg_height = len(lines) * LINE_SPACING + 30
+    subtitle_y = H - RECTANGLE_MARGIN_BOTTOM - (len(lines) - 1) * LINE_SPACING
+    text_x = (W - text_width) // 2
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (text_x, subtitle_y), (text_x + text_width, subtitle_y + subtitle_bg_height), (0, 0, 0, 180), -1, cv2.LINE_AA)
+    cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+    for i, line in enumerate(lines):
+        cv2.putText(frame, line, (text_x + 20, subtitle_y + 45 + i * LINE_SPACING), cv2.FONT_HERSHEY_SIMPLEX, TEXT_SIZE, (255, 255, 255), TEXT_THICKNESS, cv2.LINE_AA)
+    return exceeded
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_draw_matches_full_frame_blend(size):
+    rng = np.random.default_rng(size[0])
+    renderer = SubtitleRenderer()
+    for sentence in SENTENCES:
+        for _ in range(2):  # The second draw uses the cached layout
+            frame = rng.integers(0, 256, size + (3,), dtype=np.uint8)
+            expected = frame.copy()
+            expected_exceeded = legacy_draw(expected, sentence)
+            assert renderer.draw(frame, sentence) == expected_exceeded
+            np.testing.assert_array_equal(frame, expected)